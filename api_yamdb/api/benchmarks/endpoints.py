@@ -0,0 +1,404 @@
+import gc
+import json
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from itertools import count
+from math import ceil
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.cache import GROUPS, invalidate
+from api.ngram import NGRAM_INDEXES
+from api.slugs import SLUG_CACHES
+from reviews.constants import ADMIN_ROLE
+from reviews.dataset import DatasetGenerator
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+# route — имя маршрута из api/urls.py: по парам (route, method)
+# проверяется, что замеры покрывают все маршруты и методы API.
+# prepare создаёт перед каждым запросом, вне замера, объект для удаления
+# и возвращает дополнения к контексту адреса.
+Endpoint = namedtuple(
+    'Endpoint', 'name route method path data auth prepare',
+    defaults=(None,)
+)
+# Номер запроса {n} делает уникальными slug и имена создаваемых объектов.
+REQUEST_NUMBERS = count(1)
+
+
+def new_genre(context):
+    genre = Genre.objects.create(
+        name=f'Жанр {context["n"]}', slug=f'benchmark-genre-{context["n"]}'
+    )
+    return {'new_genre': genre.slug}
+
+
+def new_category(context):
+    category = Category.objects.create(
+        name=f'Категория {context["n"]}',
+        slug=f'benchmark-category-{context["n"]}'
+    )
+    return {'new_category': category.slug}
+
+
+def new_title(context):
+    title = Title.objects.create(
+        name=f'Произведение {context["n"]}', year=2000
+    )
+    return {'new_title': title.id}
+
+
+def new_review(context):
+    review = Review.objects.create(
+        title_id=new_title(context)['new_title'],
+        author=User.objects.get(username=context['username']),
+        text='Отзыв', score=5
+    )
+    return {'new_review_title': review.title_id, 'new_review': review.id}
+
+
+def new_comment(context):
+    comment = Comment.objects.create(
+        review_id=context['review'],
+        author=User.objects.get(username=context['username']),
+        text='Комментарий'
+    )
+    return {'new_comment': comment.id}
+
+
+def new_user(context):
+    user = User.objects.create(
+        username=f'benchmark-user-{context["n"]}',
+        email=f'benchmark-user-{context["n"]}@example.com'
+    )
+    return {'new_user': user.username}
+
+
+TITLE_DATA = {
+    'name': 'Произведение {n}', 'year': 2000, 'category': '{category}',
+    'genre': ['{genre}'],
+}
+REVIEWS_PATH = 'titles/{title}/reviews/'
+COMMENTS_PATH = 'titles/{title}/reviews/{review}/comments/'
+
+ENDPOINTS = (
+    Endpoint('api-root', 'api-root', 'get', '', None, True),
+    Endpoint('genres-list', 'genres-list', 'get', 'genres/', None, False),
+    Endpoint(
+        'genres-search', 'genres-list', 'get', 'genres/?search=genre', None,
+        False
+    ),
+    Endpoint(
+        'genres-create', 'genres-list', 'post', 'genres/',
+        {'name': 'Жанр {n}', 'slug': 'created-genre-{n}'}, True
+    ),
+    Endpoint(
+        'genres-delete', 'genres-detail', 'delete', 'genres/{new_genre}/',
+        None, True, new_genre
+    ),
+    Endpoint('categories-list', 'categories-list', 'get', 'categories/',
+             None, False),
+    Endpoint(
+        'categories-create', 'categories-list', 'post', 'categories/',
+        {'name': 'Категория {n}', 'slug': 'created-category-{n}'}, True
+    ),
+    Endpoint(
+        'categories-delete', 'categories-detail', 'delete',
+        'categories/{new_category}/', None, True, new_category
+    ),
+    Endpoint('titles-list', 'titles-list', 'get', 'titles/', None, False),
+    Endpoint('titles-detail', 'titles-detail', 'get', 'titles/{title}/',
+             None, False),
+    Endpoint('titles-search', 'titles-list', 'get', 'titles/?search=1',
+             None, False),
+    Endpoint(
+        'titles-create', 'titles-list', 'post', 'titles/', TITLE_DATA, True
+    ),
+    Endpoint(
+        'titles-bulk', 'titles-bulk', 'post', 'titles/bulk/',
+        [TITLE_DATA] * 10, True
+    ),
+    Endpoint(
+        'titles-update', 'titles-detail', 'patch', 'titles/{title}/',
+        {'description': 'Описание {n}'}, True
+    ),
+    Endpoint(
+        'titles-delete', 'titles-detail', 'delete', 'titles/{new_title}/',
+        None, True, new_title
+    ),
+    Endpoint('reviews-list', 'reviews-list', 'get', REVIEWS_PATH, None,
+             False),
+    Endpoint(
+        'reviews-create', 'reviews-list', 'post',
+        'titles/{new_title}/reviews/', {'text': 'Отзыв', 'score': 7}, True,
+        new_title
+    ),
+    Endpoint(
+        'reviews-detail', 'reviews-detail', 'get',
+        REVIEWS_PATH + '{review}/', None, False
+    ),
+    Endpoint(
+        'reviews-update', 'reviews-detail', 'patch',
+        REVIEWS_PATH + '{review}/', {'text': 'Отзыв {n}'}, True
+    ),
+    Endpoint(
+        'reviews-delete', 'reviews-detail', 'delete',
+        'titles/{new_review_title}/reviews/{new_review}/', None, True,
+        new_review
+    ),
+    Endpoint('comments-list', 'comments-list', 'get', COMMENTS_PATH, None,
+             False),
+    Endpoint(
+        'comments-create', 'comments-list', 'post', COMMENTS_PATH,
+        {'text': 'Комментарий {n}'}, True
+    ),
+    Endpoint(
+        'comments-detail', 'comments-detail', 'get',
+        COMMENTS_PATH + '{comment}/', None, False
+    ),
+    Endpoint(
+        'comments-update', 'comments-detail', 'patch',
+        COMMENTS_PATH + '{comment}/', {'text': 'Комментарий {n}'}, True
+    ),
+    Endpoint(
+        'comments-delete', 'comments-detail', 'delete',
+        COMMENTS_PATH + '{new_comment}/', None, True, new_comment
+    ),
+    Endpoint('users-list', 'users-list', 'get', 'users/', None, True),
+    Endpoint(
+        'users-create', 'users-list', 'post', 'users/',
+        {
+            'username': 'created-user-{n}',
+            'email': 'created-user-{n}@example.com',
+        }, True
+    ),
+    Endpoint('users-detail', 'users-detail', 'get', 'users/{username}/',
+             None, True),
+    Endpoint(
+        'users-update', 'users-detail', 'patch', 'users/{username}/',
+        {'bio': 'Биография {n}'}, True
+    ),
+    Endpoint(
+        'users-delete', 'users-detail', 'delete', 'users/{new_user}/', None,
+        True, new_user
+    ),
+    Endpoint('users-me', 'users-get-current-user-info', 'get', 'users/me/',
+             None, True),
+    Endpoint(
+        'users-me-update', 'users-get-current-user-info', 'patch',
+        'users/me/', {'bio': 'Биография {n}'}, True
+    ),
+    Endpoint(
+        'auth-signup', 'register', 'post', 'auth/signup/',
+        {'username': '{username}', 'email': '{email}'}, False
+    ),
+    Endpoint(
+        'auth-token', 'auth', 'post', 'auth/token/',
+        {'username': '{username}', 'confirmation_code': '{code}'}, False
+    ),
+    Endpoint('export-csv', 'export', 'get', 'export/titles.csv', None, True),
+    Endpoint(
+        'moderation-reviews', 'moderation-reviews', 'post',
+        'moderation/reviews/',
+        {'action': 'edit', 'ids': ['{review}'], 'text': 'Отзыв {n}'}, True
+    ),
+    Endpoint(
+        'moderation-comments', 'moderation-comments', 'post',
+        'moderation/comments/',
+        {'action': 'edit', 'ids': ['{comment}'], 'text': 'Комментарий {n}'},
+        True
+    ),
+)
+
+API_PREFIX = '/api/v1/'
+BENCHMARK_SETTINGS = {
+    # Письма только ставятся в очередь и не отправляются.
+    'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+    'EMAIL_OUTBOX_DELIVERY': 'worker',
+}
+
+
+def dataset_sizes(size):
+    """Размеры набора данных для size произведений."""
+    return {
+        'users': max(10, size // 10),
+        'categories': 10,
+        'genres': 30,
+        'titles': size,
+        'reviews': size * 10,
+        'comments': size * 5,
+    }
+
+
+def percentile(values, fraction):
+    """Перцентиль отсортированного списка по ближайшему рангу."""
+    return values[max(0, ceil(fraction * len(values)) - 1)]
+
+
+def summarize(durations, queries, status_code):
+    durations = sorted(durations)
+    total = sum(durations)
+    return {
+        'requests': len(durations),
+        'status': status_code,
+        'queries': queries,
+        'requests_per_second': round(len(durations) / total, 2),
+        'p50_ms': round(percentile(durations, 0.5) * 1000, 3),
+        'p95_ms': round(percentile(durations, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(durations, 0.99) * 1000, 3),
+        'samples_ms': [round(duration * 1000, 3) for duration in durations],
+    }
+
+
+def benchmark_context():
+    """
+    Объекты для адресов: самые популярные произведение и отзыв,
+    комментарий к нему, первые жанр и категория.
+    """
+    title = Title.objects.annotate(
+        count=Count('reviews')
+    ).order_by('-count', 'id').first()
+    user = User.objects.order_by('id').first()
+    review = Review.objects.filter(title=title).annotate(
+        count=Count('comments')
+    ).order_by('-count', 'id').first() or Review.objects.create(
+        title=title, author=user, text='Отзыв', score=5
+    )
+    comment = review.comments.order_by('id').first() or (
+        Comment.objects.create(review=review, author=user, text='Комментарий')
+    )
+    return {
+        'title': title.id,
+        'review': review.id,
+        'comment': comment.id,
+        'genre': Genre.objects.order_by('id').first().slug,
+        'category': Category.objects.order_by('id').first().slug,
+        'username': user.username,
+        'email': user.email,
+        'code': default_token_generator.make_token(user),
+    }
+
+
+def fill(value, context):
+    """Подставляет контекст в строки данных запроса."""
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, list):
+        return [fill(item, context) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, context) for key, item in value.items()}
+    return value
+
+
+def build_request(endpoint, context):
+    """Адрес и данные очередного запроса; prepare вызывается здесь."""
+    context = {**context, 'n': next(REQUEST_NUMBERS)}
+    if endpoint.prepare:
+        context.update(endpoint.prepare(context))
+    path = API_PREFIX + endpoint.path.format(**context)
+    return path, fill(endpoint.data, context)
+
+
+def send_request(client, endpoint, path, data):
+    """Отправляет запрос и дочитывает потоковый ответ."""
+    send = getattr(client, endpoint.method)
+    if data is None:
+        response = send(path)
+    elif endpoint.method == 'get':
+        response = send(path, data)
+    else:
+        response = send(
+            path, json.dumps(data), content_type='application/json'
+        )
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+@contextmanager
+def gc_disabled():
+    """Отключает сборщик мусора на время замера, как timeit."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def measure(client, endpoint, context, repeat):
+    """
+    Первый запрос считает SQL-запросы и прогревает кэши, следующие
+    repeat запросов замеряются без перехвата SQL. Подготовка данных
+    запроса в замер не входит.
+    """
+    path, data = build_request(endpoint, context)
+    with CaptureQueriesContext(connection) as queries:
+        response = send_request(client, endpoint, path, data)
+    query_count = len(queries)
+    durations = []
+    with gc_disabled():
+        for _ in range(repeat):
+            path, data = build_request(endpoint, context)
+            started = time.perf_counter()
+            send_request(client, endpoint, path, data)
+            durations.append(time.perf_counter() - started)
+    return summarize(durations, query_count, response.status_code)
+
+
+def run_size(size, repeat, seed, endpoints):
+    call_command('flush', interactive=False, verbosity=0)
+    DatasetGenerator(seed).generate(**dataset_sizes(size))
+    # Данные записаны без сигналов: сбрасываем кэши ответов и индексы.
+    invalidate(*GROUPS)
+    for index in (*NGRAM_INDEXES.values(), *SLUG_CACHES.values()):
+        index.reset()
+    # Индексы н-грамм строятся при запуске сервера, а не в замере.
+    for index in NGRAM_INDEXES.values():
+        index.build()
+    admin = User.objects.create(
+        username='benchmark-admin', email='benchmark-admin@example.com',
+        role=ADMIN_ROLE
+    )
+    context = benchmark_context()
+    anonymous = Client()
+    authorized = Client(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}'
+    )
+    return {
+        endpoint.name: measure(
+            authorized if endpoint.auth else anonymous,
+            endpoint, context, repeat
+        )
+        for endpoint in endpoints
+    }
+
+
+def run_benchmarks(sizes, repeat=50, seed=0, endpoints=ENDPOINTS):
+    """
+    Прогоняет эндпоинты на наборах данных из sizes произведений.
+    Каждый размер начинается с очистки базы, поэтому запускать
+    только на тестовой базе.
+    """
+    # Частота None отключает ограничение запросов для области.
+    rates = dict.fromkeys(api_settings.DEFAULT_THROTTLE_RATES)
+    with override_settings(**BENCHMARK_SETTINGS, REST_FRAMEWORK={
+        **api_settings.user_settings, 'DEFAULT_THROTTLE_RATES': rates,
+    }):
+        return {
+            'repeat': repeat,
+            'seed': seed,
+            'sizes': {
+                str(size): run_size(size, repeat, seed, endpoints)
+                for size in sizes
+            },
+        }
@@ -0,0 +1,228 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.benchmarks.endpoints import gc_disabled
+from api.cache import CATEGORIES, GENRES
+from api.permissions import (
+    IsAdmin, IsAdminOrReadOnly, IsAuthorModeratorAdminOrReadOnly
+)
+from api.serializers import (
+    CommentSerializer, ReviewSerializer, TitleEditSerializer,
+    TitleReadSerializer, UserSerializer
+)
+from api.slugs import SLUG_CACHES
+from reviews.constants import ADMIN_ROLE, MODERATOR_ROLE, USER_ROLE
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+PUB_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+ROLES = (USER_ROLE, MODERATOR_ROLE, ADMIN_ROLE)
+
+
+def block_queries(execute, sql, params, many, context):
+    raise AssertionError(f'Микробенчмарк обратился к базе: {sql}')
+
+
+def with_prefetched(instance, name, objects):
+    """Подставляет объекты связи many-to-many как после prefetch_related."""
+    queryset = getattr(instance, name).model.objects.all()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache = {name: queryset}
+    return instance
+
+
+def build_objects(count):
+    """Объекты моделей в памяти, без сохранения в базу."""
+    category = Category(pk=1, name='Фильм', slug='films')
+    genres = [
+        Genre(pk=pk, name=f'Жанр {pk}', slug=f'genre-{pk}')
+        for pk in range(1, 4)
+    ]
+    users = [
+        User(
+            pk=pk, username=f'user{pk}', email=f'user{pk}@example.com',
+            role=ROLES[pk % len(ROLES)], bio='Биография'
+        )
+        for pk in range(1, count + 1)
+    ]
+    titles = [
+        with_prefetched(Title(
+            pk=pk, name=f'Произведение {pk}', year=2000, rating=pk % 10 + 1,
+            description='Описание', category=category
+        ), 'genre', genres)
+        for pk in range(1, count + 1)
+    ]
+    reviews = [
+        Review(
+            pk=pk, title=title, author=user, text='Отзыв', score=7,
+            pub_date=PUB_DATE
+        )
+        for pk, title, user in zip(range(1, count + 1), titles, users)
+    ]
+    comments = [
+        Comment(
+            pk=pk, review=review, author=user, text='Комментарий',
+            pub_date=PUB_DATE
+        )
+        for pk, review, user in zip(range(1, count + 1), reviews, users)
+    ]
+    return {
+        'category': category, 'genres': genres, 'users': users,
+        'titles': titles, 'reviews': reviews, 'comments': comments,
+    }
+
+
+@contextmanager
+def filled_slug_caches(category, genres):
+    """Заполняет кеши slug без запросов и восстанавливает их после."""
+    saved = {
+        key: (cache.ids, cache.slugs, cache.built_at)
+        for key, cache in SLUG_CACHES.items()
+    }
+    for key, objects in ((CATEGORIES, [category]), (GENRES, genres)):
+        cache = SLUG_CACHES[key]
+        cache.ids = {obj.slug: obj.pk for obj in objects}
+        cache.slugs = {obj.pk: obj.slug for obj in objects}
+        cache.built_at = time.monotonic()
+    try:
+        yield
+    finally:
+        for key, (ids, slugs, built_at) in saved.items():
+            cache = SLUG_CACHES[key]
+            cache.ids, cache.slugs, cache.built_at = ids, slugs, built_at
+
+
+def serializer_cases(objects):
+    """Случаи (имя, функция над одним объектом, объекты)."""
+    title_data = {
+        'name': 'Произведение', 'year': 2000, 'description': 'Описание',
+        'category': objects['category'].slug,
+        'genre': [genre.slug for genre in objects['genres']],
+    }
+    count = len(objects['titles'])
+
+    def validate(serializer_class, data):
+        def run(_):
+            serializer = serializer_class(data=data)
+            serializer.is_valid(raise_exception=True)
+            return serializer.validated_data
+        return run
+
+    return (
+        ('TitleReadSerializer.to_representation',
+         lambda obj: TitleReadSerializer(obj).data, objects['titles']),
+        ('TitleEditSerializer.to_representation',
+         lambda obj: TitleEditSerializer(obj).data, objects['titles']),
+        ('TitleEditSerializer.validate',
+         validate(TitleEditSerializer, title_data), range(count)),
+        ('ReviewSerializer.to_representation',
+         lambda obj: ReviewSerializer(obj).data, objects['reviews']),
+        ('ReviewSerializer.validate',
+         validate(ReviewSerializer, {'text': 'Отзыв', 'score': 7}),
+         range(count)),
+        ('CommentSerializer.to_representation',
+         lambda obj: CommentSerializer(obj).data, objects['comments']),
+        ('CommentSerializer.validate',
+         validate(CommentSerializer, {'text': 'Комментарий'}),
+         range(count)),
+        ('UserSerializer.to_representation',
+         lambda obj: UserSerializer(obj).data, objects['users']),
+    )
+
+
+def permission_cases(objects):
+    """
+    Проверки прав для смеси анонимных и авторизованных запросов
+    на чтение и изменение, как их выполняет APIView.
+    """
+    factory = APIRequestFactory()
+    requests = []
+    for user in (AnonymousUser(), *objects['users'][:len(ROLES)]):
+        for method in ('get', 'patch'):
+            request = Request(getattr(factory, method)('/'))
+            request.user = user
+            requests.append(request)
+    review = objects['reviews'][0]
+    checks = [
+        (request, review) for request in requests
+    ] * (len(objects['reviews']) // len(requests) + 1)
+    checks = checks[:len(objects['reviews'])]
+
+    def check(permission_class):
+        permission = permission_class()
+
+        def run(item):
+            request, obj = item
+            return permission.has_permission(request, None) and (
+                permission.has_object_permission(request, None, obj)
+            )
+        return run
+
+    return tuple(
+        (permission_class.__name__, check(permission_class), checks)
+        for permission_class in (
+            IsAdmin, IsAdminOrReadOnly, IsAuthorModeratorAdminOrReadOnly
+        )
+    )
+
+
+def measure(function, items, repeat):
+    """
+    Скорость в объектах в секунду — лучший из repeat проходов,
+    samples_ms — время на объект в каждом проходе.
+    Память — средний пик выделенной tracemalloc памяти при обработке
+    одного объекта.
+    """
+    items = list(items)
+    passes = []
+    with gc_disabled():
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for item in items:
+                function(item)
+            passes.append(time.perf_counter() - started)
+    peaks = 0
+    tracemalloc.start()
+    try:
+        for item in items:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function(item)
+            peaks += tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return {
+        'objects': len(items),
+        'objects_per_second': round(len(items) / min(passes), 2),
+        'peak_bytes_per_object': round(peaks / len(items), 1),
+        'samples_ms': [
+            round(elapsed * 1000 / len(items), 6) for elapsed in passes
+        ],
+    }
+
+
+def run_microbenchmarks(count=1000, repeat=5):
+    """
+    Замеряет сериализаторы и классы прав на объектах в памяти.
+    Любое обращение к базе во время замеров считается ошибкой.
+    """
+    objects = build_objects(count)
+    cases = serializer_cases(objects) + permission_cases(objects)
+    with connection.execute_wrapper(block_queries), filled_slug_caches(
+        objects['category'], objects['genres']
+    ):
+        return {
+            'objects': count,
+            'repeat': repeat,
+            'cases': {
+                name: measure(function, items, repeat)
+                for name, function, items in cases
+            },
+        }
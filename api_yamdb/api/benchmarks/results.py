@@ -0,0 +1,179 @@
+import json
+import platform
+from datetime import datetime, timezone
+from math import sqrt
+from pathlib import Path
+from statistics import NormalDist, median
+
+import django
+from django.conf import settings
+from django.db import connection
+
+# Версия формата файла результатов: меняется при несовместимых правках.
+FORMAT_VERSION = 1
+KIND_ENDPOINTS = 'endpoints'
+KIND_MICRO = 'micro'
+
+# Метрики, рост которых означает ухудшение.
+GROWTH_METRICS = ('peak_bytes_per_object',)
+
+
+class ResultsError(Exception):
+    """Файл результатов не читается или несовместим."""
+
+
+def build_document(kind, results):
+    return {
+        'format_version': FORMAT_VERSION,
+        'kind': kind,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+        },
+        'results': results,
+    }
+
+
+def save_document(document, directory=None):
+    """
+    Сохраняет результаты в BENCHMARK_RESULTS_DIR/<kind>/ под именем
+    с временем запуска и возвращает путь к файлу.
+    """
+    directory = Path(directory or settings.BENCHMARK_RESULTS_DIR)
+    directory = directory / document['kind']
+    directory.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.fromisoformat(document['created_at'])
+    path = directory / f'{created_at:%Y%m%dT%H%M%S%fZ}.json'
+    path.write_text(dump_document(document), encoding='utf-8')
+    return path
+
+
+def dump_document(document):
+    return json.dumps(document, indent=2) + '\n'
+
+
+def load_document(path):
+    try:
+        document = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError) as error:
+        raise ResultsError(f'Не удалось прочитать {path}: {error}')
+    if document.get('format_version') != FORMAT_VERSION:
+        raise ResultsError(
+            f'{path}: версия формата {document.get("format_version")}, '
+            f'ожидается {FORMAT_VERSION}.'
+        )
+    return document
+
+
+def document_cases(document):
+    """Метрики по случаям: для эндпоинтов имя вида '<размер>/<эндпоинт>'."""
+    results = document['results']
+    if document['kind'] == KIND_ENDPOINTS:
+        return {
+            f'{size}/{name}': metrics
+            for size, endpoints in results['sizes'].items()
+            for name, metrics in endpoints.items()
+        }
+    return dict(results['cases'])
+
+
+def mann_whitney_p(baseline, current):
+    """
+    Односторонний критерий Манна — Уитни в нормальном приближении:
+    вероятность получить такой сдвиг current вверх при отсутствии
+    разницы между выборками.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    values = sorted(
+        [(value, True) for value in current]
+        + [(value, False) for value in baseline]
+    )
+    rank_sum, ties, index = 0.0, 0, 0
+    while index < len(values):
+        end = index
+        while end < len(values) and values[end][0] == values[index][0]:
+            end += 1
+        size = end - index
+        rank = (index + end + 1) / 2
+        rank_sum += rank * sum(1 for item in values[index:end] if item[1])
+        ties += size ** 3 - size
+        index = end
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sqrt(variance)
+    return 1 - NormalDist().cdf(z)
+
+
+def compare_documents(baseline, current, threshold, alpha):
+    """
+    Сравнивает прогон с эталоном. Возвращает список регрессий:
+    - замедление медианы samples_ms больше threshold при p < alpha;
+    - рост числа SQL-запросов или изменение статуса ответа;
+    - рост памяти на объект больше threshold.
+    """
+    if baseline['kind'] != current['kind']:
+        raise ResultsError(
+            f'Нельзя сравнить результаты {baseline["kind"]} '
+            f'и {current["kind"]}.'
+        )
+    regressions = []
+    current_cases = document_cases(current)
+    for case, base in document_cases(baseline).items():
+        metrics = current_cases.get(case)
+        if metrics is None:
+            continue
+        regressions.extend(
+            dict(case=case, **regression)
+            for regression in compare_metrics(base, metrics, threshold, alpha)
+        )
+    return regressions
+
+
+def compare_metrics(base, current, threshold, alpha):
+    if base.get('samples_ms') and current.get('samples_ms'):
+        base_median = median(base['samples_ms'])
+        current_median = median(current['samples_ms'])
+        change = current_median / base_median - 1 if base_median else 0
+        p_value = mann_whitney_p(base['samples_ms'], current['samples_ms'])
+        if change > threshold and p_value < alpha:
+            yield {
+                'metric': 'median_ms', 'baseline': round(base_median, 6),
+                'current': round(current_median, 6),
+                'change': round(change, 4),
+                'p_value': round(p_value, 6),
+            }
+    for metric in ('queries', 'status'):
+        if metric in base and current.get(metric) != base[metric] and (
+            metric == 'status' or current.get(metric, 0) > base[metric]
+        ):
+            yield {
+                'metric': metric, 'baseline': base[metric],
+                'current': current.get(metric),
+            }
+    for metric in GROWTH_METRICS:
+        if base.get(metric) and metric in current:
+            change = current[metric] / base[metric] - 1
+            if change > threshold:
+                yield {
+                    'metric': metric, 'baseline': base[metric],
+                    'current': current[metric], 'change': round(change, 4),
+                }
+
+
+def write_report(command, kind, results, output=None, save=False):
+    """Выводит результаты команды замеров и при необходимости сохраняет."""
+    document = build_document(kind, results)
+    if output:
+        Path(output).write_text(dump_document(document), encoding='utf-8')
+    if save:
+        path = save_document(document)
+        command.stderr.write(f'Результаты сохранены в {path}.')
+    if not output:
+        command.stdout.write(dump_document(document), ending='')
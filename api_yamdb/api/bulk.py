@@ -0,0 +1,175 @@
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import Title
+from reviews.search import get_search_backend
+from .cache import CATEGORIES, GENRES, TITLES, invalidate
+from .serializers import TitleEditSerializer
+from .slugs import SLUG_CACHES, reset_slug_caches
+
+CREATED = 'created'
+UPDATED = 'updated'
+VALID = 'valid'
+INVALID = 'invalid'
+
+
+def resolve_slugs(items):
+    """Заполняет кеши slug для всех жанров и категорий пакета сразу."""
+    categories, genres = set(), set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if isinstance(item.get('category'), str):
+            categories.add(item['category'])
+        if isinstance(item.get('genre'), list):
+            genres.update(
+                slug for slug in item['genre'] if isinstance(slug, str)
+            )
+    SLUG_CACHES[CATEGORIES].resolve(list(categories))
+    SLUG_CACHES[GENRES].resolve(list(genres))
+
+
+def validate_titles(items, context):
+    """
+    Проверяет все элементы пакета. Элемент с id обновляет существующее
+    произведение, без id — создаёт новое.
+    Возвращает список сериализаторов и список ошибок по элементам.
+    """
+    ids = [
+        item['id'] for item in items
+        if isinstance(item, dict) and isinstance(item.get('id'), int)
+    ]
+    instances = Title.objects.in_bulk(ids)
+    serializers, errors = [], []
+    for item in items:
+        serializer = None
+        if not isinstance(item, dict):
+            error = {'non_field_errors': ['Ожидается объект произведения.']}
+        elif 'id' in item and (
+            not isinstance(item['id'], int) or item['id'] not in instances
+        ):
+            error = {'id': ['Произведение не найдено.']}
+        else:
+            serializer = TitleEditSerializer(
+                instances.get(item.get('id')), data=item,
+                partial='id' in item, context=context
+            )
+            error = None if serializer.is_valid() else serializer.errors
+        serializers.append(serializer)
+        errors.append(error)
+    return serializers, errors
+
+
+def assign_pks(titles):
+    """
+    Проставляет id произведениям после bulk_create на SQLite, где вставка
+    не возвращает их. Корректно только для SQLite: первая вставка берёт
+    блокировку записи всей базы до конца транзакции, а AUTOINCREMENT
+    выдаёт возрастающие id, поэтому последние len(titles) строк таблицы —
+    это вставленные строки. На других СУБД чужие вставки могут
+    чередоваться с нашими.
+    """
+    if not titles or titles[0].pk is not None:
+        return
+    pks = Title.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(titles)]
+    for title, pk in zip(titles, reversed(pks)):
+        title.pk = pk
+
+
+def create_titles(titles, batch_size):
+    """
+    Вставляет новые произведения и проставляет им id: одним bulk_create,
+    если СУБД возвращает id из вставки или это SQLite, иначе по одному.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        Title.objects.bulk_create(titles, batch_size=batch_size)
+    elif connection.vendor == 'sqlite':
+        Title.objects.bulk_create(titles, batch_size=batch_size)
+        assign_pks(titles)
+    else:
+        for title in titles:
+            title.save()
+
+
+def save_titles(serializers):
+    batch_size = settings.TITLES_BULK_BATCH_SIZE
+    created, updated, update_fields, genres = [], [], set(), {}
+    for serializer in serializers:
+        data = dict(serializer.validated_data)
+        title_genres = data.pop('genre', None)
+        if serializer.instance is None:
+            title = serializer.instance = Title(**data)
+            created.append(title)
+        else:
+            title = serializer.instance
+            for field, value in data.items():
+                setattr(title, field, value)
+            update_fields.update(data)
+            updated.append(title)
+        if title_genres is not None:
+            genres[id(title)] = (title, title_genres)
+    through = Title.genre.through
+    with transaction.atomic():
+        create_titles(created, batch_size)
+        if update_fields:
+            Title.objects.bulk_update(
+                updated, update_fields, batch_size=batch_size
+            )
+        through.objects.filter(title_id__in=[
+            title.pk for title in updated if id(title) in genres
+        ]).delete()
+        through.objects.bulk_create([
+            through(title_id=title.pk, genre_id=genre_id)
+            for title, title_genres in genres.values()
+            for genre_id in {genre.pk for genre in title_genres}
+        ], batch_size=batch_size)
+        # Массовые операции не отправляют сигналы сохранения.
+        get_search_backend().index_many(created + updated)
+        invalidate(TITLES)
+
+
+def invalid_results(errors):
+    return [
+        {'status': INVALID, 'errors': error} if error
+        else {'status': VALID}
+        for error in errors
+    ]
+
+
+def bulk_save_titles(items, context):
+    """
+    Проверяет пакет произведений целиком и, если ошибок нет, сохраняет его
+    в одной транзакции. Возвращает результаты по элементам и признак
+    сохранения.
+    """
+    if not isinstance(items, list):
+        raise ValidationError('Ожидается список произведений.')
+    if len(items) > settings.TITLES_BULK_MAX_ITEMS:
+        raise ValidationError(
+            'В пакете не больше '
+            f'{settings.TITLES_BULK_MAX_ITEMS} произведений.'
+        )
+    resolve_slugs(items)
+    serializers, errors = validate_titles(items, context)
+    if any(errors):
+        return invalid_results(errors), False
+    statuses = [
+        UPDATED if serializer.instance else CREATED
+        for serializer in serializers
+    ]
+    try:
+        save_titles(serializers)
+    except IntegrityError:
+        # Жанр или категория из кеша slug удалены в другом процессе.
+        reset_slug_caches()
+        errors = [serializer.slug_errors() for serializer in serializers]
+        if not any(errors):
+            raise
+        return invalid_results(errors), False
+    return [
+        {'id': serializer.instance.pk, 'status': status}
+        for serializer, status in zip(serializers, statuses)
+    ], True
@@ -0,0 +1,151 @@
+from hashlib import md5
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES = 'titles'
+REVIEWS = 'reviews'
+COMMENTS = 'comments'
+USERS = 'users'
+GROUPS = (CATEGORIES, GENRES, TITLES, REVIEWS, COMMENTS, USERS)
+LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def is_shared_cache():
+    """Проверяет, видят ли другие процессы записи в кэш каталога."""
+    return not isinstance(get_cache(), LOCAL_CACHE_BACKENDS)
+
+
+def etags_enabled():
+    """
+    ETag отдаются только при общем кэше версий: с кэшем в памяти процесса
+    сброс версии в одном процессе не виден другим, и они отвечали бы 304
+    на изменённые данные.
+    """
+    if settings.CATALOG_CACHE_ETAGS is None:
+        return is_shared_cache()
+    return settings.CATALOG_CACHE_ETAGS
+
+
+def version_timeout():
+    """
+    Срок жизни версий групп. В общем кэше версия сбрасывается всеми
+    процессами и хранится бессрочно, чтобы ETag не менялся без записи;
+    в кэше процесса она живёт не дольше ответов.
+    """
+    if is_shared_cache():
+        return None
+    return settings.CATALOG_CACHE_TIMEOUT
+
+
+def version_key(group):
+    return f'version:{group}'
+
+
+def get_version(group):
+    """
+    Возвращает версию группы ответов. Начальная версия берётся по времени,
+    чтобы после вытеснения ключа не отдать устаревшие ответы.
+    """
+    cache = get_cache()
+    version = cache.get(version_key(group))
+    if version is None:
+        cache.add(version_key(group), time_ns(), version_timeout())
+        version = cache.get(version_key(group))
+    return version
+
+
+def invalidate(*groups):
+    """Сбрасывает закэшированные ответы групп после фиксации транзакции."""
+    def bump():
+        cache = get_cache()
+        for group in groups:
+            cache.set(version_key(group), time_ns(), version_timeout())
+    transaction.on_commit(bump)
+
+
+def response_key(group, request):
+    path = md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'catalog:{group}:{get_version(group)}:{path}'
+
+
+class CatalogCacheMixin:
+    """Кэширует ответы на GET-запросы списка (и объекта) каталога."""
+    cache_group = None
+
+    def cached(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = response_key(self.cache_group, request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """
+    Отдаёт ETag, построенный по версиям групп данных, и отвечает
+    304 Not Modified до выполнения запросов к базе и сериализации.
+    Отключается, если кэш версий не общий для процессов (etags_enabled).
+    """
+    etag_groups = ()
+
+    def get_etag(self, request):
+        versions = ':'.join(
+            str(get_version(group)) for group in self.etag_groups
+        )
+        source = (
+            f'{versions}:{request.build_absolute_uri()}:'
+            f'{request.user.pk}:{request.accepted_renderer.format}'
+        )
+        return f'"{md5(source.encode()).hexdigest()}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if (
+            request.method == 'GET' and self.etag_groups
+            and etags_enabled()
+        ):
+            self.etag = self.get_etag(request)
+            if get_conditional_response(request, etag=self.etag):
+                raise NotModified
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if getattr(self, 'etag', None) and response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = self.etag
+        return response
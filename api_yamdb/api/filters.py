@@ -1,6 +1,7 @@
 from django_filters import rest_framework as filters
 
 from reviews.models import Title
+from reviews.search import get_search_backend
 
 
 class TitleFilter(filters.FilterSet):
@@ -11,7 +12,13 @@ class TitleFilter(filters.FilterSet):
     category = filters.CharFilter(
         field_name='category__slug', lookup_expr='exact'
     )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'genre', 'category', 'year', )
+        fields = ('name', 'genre', 'category', 'year', 'search', )
+
+    def filter_search(self, queryset, name, value):
+        return get_search_backend().search(queryset, value).order_by(
+            'search_rank', 'id'
+        )
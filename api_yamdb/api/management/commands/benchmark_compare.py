@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks.results import (
+    ResultsError, compare_documents, load_document
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает результаты замеров с эталоном и завершается с ошибкой, '
+        'если найдены значимые замедления или рост числа SQL-запросов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('baseline', help='Файл эталонных результатов.')
+        parser.add_argument('current', help='Файл проверяемых результатов.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help=(
+                'Допустимое относительное ухудшение, по умолчанию 25%%: '
+                'разброс между запусками на одной машине бывает больше 10%%.'
+            )
+        )
+        parser.add_argument(
+            '--alpha', type=float, default=0.01,
+            help='Уровень значимости критерия Манна — Уитни.'
+        )
+        parser.add_argument(
+            '--json', action='store_true',
+            help='Вывести регрессии в формате JSON.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            regressions = compare_documents(
+                load_document(options['baseline']),
+                load_document(options['current']),
+                options['threshold'], options['alpha'],
+            )
+        except ResultsError as error:
+            raise CommandError(error, returncode=2)
+        if options['json']:
+            self.stdout.write(json.dumps(regressions, indent=2))
+        else:
+            for regression in regressions:
+                self.stdout.write(
+                    f'{regression["case"]}: {regression["metric"]} '
+                    f'{regression["baseline"]} -> {regression["current"]}'
+                )
+        if regressions:
+            raise CommandError(f'Найдено регрессий: {len(regressions)}.')
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS('Регрессий не найдено.'))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.benchmarks.endpoints import ENDPOINTS, run_benchmarks
+from api.benchmarks.results import KIND_ENDPOINTS, write_report
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет запросы в секунду, задержки p50/p95/p99 и число '
+        'SQL-запросов эндпоинтов API на тестовой базе.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[100, 1000],
+            help='Количества произведений в наборах данных.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Количество замеряемых запросов к каждому эндпоинту.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--endpoint', action='append',
+            help='Замерить только эндпоинт с этим именем.'
+        )
+        parser.add_argument('--output', help='Файл для результата в JSON.')
+        parser.add_argument(
+            '--save', action='store_true',
+            help='Сохранить результат в BENCHMARK_RESULTS_DIR.'
+        )
+
+    def handle(self, *args, **options):
+        endpoints = ENDPOINTS
+        if options['endpoint']:
+            endpoints = [
+                endpoint for endpoint in ENDPOINTS
+                if endpoint.name in options['endpoint']
+            ]
+            if not endpoints:
+                raise CommandError('Нет эндпоинтов с такими именами.')
+        # Замеры очищают базу, поэтому работают на отдельной тестовой.
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0)
+        try:
+            results = run_benchmarks(
+                options['sizes'], options['repeat'], options['seed'],
+                endpoints
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        write_report(
+            self, KIND_ENDPOINTS, results, options['output'], options['save']
+        )
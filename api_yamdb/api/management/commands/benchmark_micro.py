@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.micro import run_microbenchmarks
+from api.benchmarks.results import KIND_MICRO, write_report
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет сериализаторы и классы прав на объектах в памяти: '
+        'объекты в секунду и память на объект.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--objects', type=int, default=1000,
+            help='Количество объектов в каждом замере.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Количество проходов, берётся лучший.'
+        )
+        parser.add_argument('--output', help='Файл для результата в JSON.')
+        parser.add_argument(
+            '--save', action='store_true',
+            help='Сохранить результат в BENCHMARK_RESULTS_DIR.'
+        )
+
+    def handle(self, *args, **options):
+        results = run_microbenchmarks(options['objects'], options['repeat'])
+        write_report(
+            self, KIND_MICRO, results, options['output'], options['save']
+        )
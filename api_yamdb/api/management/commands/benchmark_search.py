@@ -0,0 +1,46 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.ngram import NGRAM_INDEXES
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время поиска по индексу н-грамм и через icontains '
+        'для жанров, категорий и пользователей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='+', help='Поисковые строки.')
+        parser.add_argument(
+            '--repeat', type=int, default=100,
+            help='Сколько раз повторить каждый запрос.'
+        )
+
+    def measure(self, search, queries, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for query in queries:
+                search(query)
+        elapsed = time.perf_counter() - started
+        return round(elapsed / (repeat * len(queries)) * 1000, 4)
+
+    def handle(self, *args, **options):
+        queries, repeat = options['queries'], options['repeat']
+        results = {}
+        for name, index in NGRAM_INDEXES.items():
+            index.build()
+            lookup = f'{index.field}__icontains'
+            results[name] = {
+                'rows': len(index.values),
+                'icontains_ms': self.measure(
+                    lambda query: list(index.model.objects.filter(
+                        **{lookup: query}
+                    ).values_list('pk', flat=True)),
+                    queries, repeat
+                ),
+                'ngram_ms': self.measure(index.search, queries, repeat),
+            }
+        self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
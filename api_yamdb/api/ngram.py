@@ -0,0 +1,210 @@
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, RLock
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Q
+from rest_framework.filters import SearchFilter
+
+from reviews.models import Category, Genre, User
+
+from .cache import CATEGORIES, GENRES, USERS
+
+NGRAM_SIZE = 3
+
+_executor = None
+_executor_lock = Lock()
+
+
+def normalize(value):
+    return ' '.join(value.lower().split())
+
+
+def ngrams(value, size=NGRAM_SIZE):
+    """Н-граммы строки с отступами по краям, как в pg_trgm."""
+    padded = f'{" " * (size - 1)}{value} '
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='ngram-index'
+            )
+    return _executor
+
+
+class NgramIndex:
+    """
+    Индекс н-грамм одного текстового поля модели в памяти процесса.
+    Строится в фоновом потоке при запуске и при первом поиске, обновляется
+    сигналами и перестраивается в фоне раз в NGRAM_INDEX_TTL секунд.
+    Записи других процессов с id больше max_pk, последнего id на момент
+    построения, поиск дочитывает из базы (см. NgramSearchFilter).
+    """
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.lock = RLock()
+        self.values = {}
+        self.sizes = {}
+        self.postings = defaultdict(set)
+        self.max_pk = 0
+        self.built_at = None
+        self.building = False
+
+    def build(self):
+        """Строит индекс заново и подменяет им текущий под блокировкой."""
+        fresh = NgramIndex(self.model, self.field)
+        rows = self.model.objects.order_by('pk').values_list('pk', self.field)
+        for pk, value in rows.iterator():
+            fresh._add(pk, value)
+            fresh.max_pk = pk
+        with self.lock:
+            self.values, self.sizes = fresh.values, fresh.sizes
+            self.postings, self.max_pk = fresh.postings, fresh.max_pk
+            self.built_at = time.monotonic()
+
+    def build_in_thread(self):
+        close_old_connections()
+        try:
+            self.build()
+        finally:
+            with self.lock:
+                self.building = False
+            connection.close()
+
+    def reset(self):
+        """Очищает индекс: до построения поиск идёт только по базе."""
+        with self.lock:
+            self.values, self.sizes = {}, {}
+            self.postings = defaultdict(set)
+            self.max_pk = 0
+            self.built_at = None
+
+    def ensure_built(self):
+        """
+        Запускает построение устаревшего индекса. В фоне, если включено
+        NGRAM_INDEX_BACKGROUND: запрос тем временем обслуживает текущий
+        индекс вместе с запросом к базе.
+        """
+        with self.lock:
+            if self.building or (
+                self.built_at is not None
+                and time.monotonic() - self.built_at < settings.NGRAM_INDEX_TTL
+            ):
+                return
+            self.building = settings.NGRAM_INDEX_BACKGROUND
+        if self.building:
+            get_executor().submit(self.build_in_thread)
+        else:
+            self.build()
+
+    def _add(self, pk, value):
+        value = normalize(value)
+        grams = ngrams(value)
+        self.values[pk] = value
+        self.sizes[pk] = len(grams)
+        for gram in grams:
+            self.postings[gram].add(pk)
+
+    def _remove(self, pk):
+        value = self.values.pop(pk, None)
+        if value is None:
+            return
+        del self.sizes[pk]
+        for gram in ngrams(value):
+            self.postings[gram].discard(pk)
+            if not self.postings[gram]:
+                del self.postings[gram]
+
+    def add(self, pk, value):
+        with self.lock:
+            if self.built_at is not None:
+                self._remove(pk)
+                self._add(pk, value)
+
+    def remove(self, pk):
+        with self.lock:
+            if self.built_at is not None:
+                self._remove(pk)
+
+    def contains(self, query):
+        """Первичные ключи записей, в которых query встречается целиком."""
+        inner = {
+            query[i:i + NGRAM_SIZE]
+            for i in range(len(query) - NGRAM_SIZE + 1)
+        }
+        if inner:
+            candidates = set.intersection(*(
+                self.postings.get(gram, set()) for gram in inner
+            ))
+        else:
+            candidates = self.values
+        return [pk for pk in candidates if query in self.values[pk]]
+
+    def similar(self, query):
+        """
+        Первичные ключи записей, похожих на query по доле общих н-грамм
+        не меньше NGRAM_SIMILARITY — поиск с опечатками.
+        """
+        grams = ngrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        result = []
+        for pk, common in shared.items():
+            total = len(grams) + self.sizes[pk] - common
+            if common / total >= settings.NGRAM_SIMILARITY:
+                result.append(pk)
+        return result
+
+    def search(self, query):
+        """
+        Ищет записи, содержащие query; если таких нет — похожие на query.
+        Возвращает найденные id и max_pk индекса.
+        """
+        query = normalize(query)
+        self.ensure_built()
+        with self.lock:
+            return self.contains(query) or self.similar(query), self.max_pk
+
+
+NGRAM_INDEXES = {
+    CATEGORIES: NgramIndex(Category, 'name'),
+    GENRES: NgramIndex(Genre, 'name'),
+    USERS: NgramIndex(User, 'username'),
+}
+
+
+def build_indexes_in_background():
+    """Строит все индексы н-грамм в фоне, вызывается при запуске."""
+    for index in NGRAM_INDEXES.values():
+        index.ensure_built()
+
+
+class NgramSearchFilter(SearchFilter):
+    """
+    SearchFilter, который ищет по индексу н-грамм и исправляет опечатки.
+    Записи, которых ещё нет в индексе (созданные другими процессами),
+    ищутся по вхождению в базе среди id больше max_pk индекса.
+    Представление задаёт индекс в search_index.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        index = NGRAM_INDEXES[view.search_index]
+        condition = Q()
+        for term in terms:
+            pks, max_pk = index.search(term)
+            condition &= Q(pk__in=pks) | Q(
+                pk__gt=max_pk, **{f'{index.field}__icontains': term}
+            )
+        return queryset.filter(condition)
@@ -0,0 +1,136 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Постраничный вывод по ключу (pub_date, id) без OFFSET."""
+    ordering = ('pub_date', 'id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class RatingCursorPagination(BasePagination):
+    """
+    Постраничный вывод произведений по ключу (rating, id) без OFFSET
+    и без подсчёта общего количества. Листается только вперёд.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    ordering = ('rating', 'id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.after(*position))
+        results = list(queryset[:self.page_size + 1])
+        self.next_position = None
+        if len(results) > self.page_size:
+            last = results[self.page_size - 1]
+            self.next_position = (last.rating, last.id)
+        return results[:self.page_size]
+
+    @staticmethod
+    def after(rating, pk):
+        """Условие «строго после (rating, id)» с учётом порядка NULL в СУБД."""
+        nulls_last = connection.features.nulls_order_largest
+        if rating is None:
+            condition = Q(rating__isnull=True, id__gt=pk)
+            return condition if nulls_last else (
+                condition | Q(rating__isnull=False)
+            )
+        condition = Q(rating=rating, id__gt=pk) | Q(rating__gt=rating)
+        return condition | Q(rating__isnull=True) if nulls_last else condition
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            rating, pk = b64decode(
+                encoded.encode('ascii')
+            ).decode('ascii').split(':')
+            return (int(rating) if rating else None), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, rating, pk):
+        position = f'{"" if rating is None else rating}:{pk}'
+        return b64encode(position.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(*self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+
+class CursorModeMixin:
+    """
+    Переключает пагинацию в режим курсора, если в запросе есть
+    параметр cursor (для первой страницы — пустой).
+    """
+    cursor_query_param = 'cursor'
+    cursor_pagination_class = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class LimitOffsetOrCursorPagination(CursorModeMixin, LimitOffsetPagination):
+    """Пагинация limit/offset или по курсору (pub_date, id)."""
+    cursor_pagination_class = PubDateCursorPagination
+
+
+class PageNumberOrCursorPagination(CursorModeMixin, PageNumberPagination):
+    """Постраничная пагинация или по курсору (rating, id) без COUNT."""
+    cursor_pagination_class = RatingCursorPagination
@@ -0,0 +1,26 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Разбирает поток JSON-объектов, по одному в строке, в список."""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        if stream is None:
+            return items
+        for number, line in enumerate(iter(stream.readline, b''), 1):
+            line = line.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error in line {number}: {exc}')
+        return items
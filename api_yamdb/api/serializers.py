@@ -1,15 +1,17 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from django.db.models import Avg
+from rest_framework.settings import api_settings
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.tokens import default_token_generator
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 from reviews.models import User
 from reviews.constants import MAX_LENGTH_USERNAME, MAX_LENGTH_EMAIL
 from reviews.models import Category, Genre, Title, User, Comment, Review
 from reviews.validators import validate_username
+from .cache import CATEGORIES, GENRES
+from .slugs import CachedSlugRelatedField, reset_slug_caches
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -92,41 +94,63 @@ class TitleReadSerializer(serializers.ModelSerializer):
 
 
 class TitleEditSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(), slug_field='slug'
+    category = CachedSlugRelatedField(
+        CATEGORIES, queryset=Category.objects.all()
     )
-    genre = serializers.SlugRelatedField(
+    genre = CachedSlugRelatedField(
+        GENRES,
         queryset=Genre.objects.all(),
-        slug_field='slug',
         many=True,
         allow_null=False,
         allow_empty=False
     )
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         fields = (
             'id',
             'name',
             'year',
+            'rating',
             'description',
             'genre',
             'category'
         )
         model = Title
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        reviews = instance.reviews.all()
-        if reviews.exists():
-            representation['rating'] = int(
-                reviews.aggregate(Avg('score'))['score__avg']
-            )
-        else:
-            representation['rating'] = None
-        representation.move_to_end('description')
-        representation.move_to_end('genre')
-        representation.move_to_end('category')
-        return representation
+    def create(self, validated_data):
+        return self.save_checked(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self.save_checked(super().update, instance, validated_data)
+
+    def save_checked(self, save, *args):
+        # Кеш slug мог сохранить жанр или категорию, удалённые в другом
+        # процессе: тогда запись нарушает внешний ключ при фиксации.
+        try:
+            with transaction.atomic():
+                return save(*args)
+        except IntegrityError:
+            reset_slug_caches()
+            errors = self.slug_errors()
+            if not errors:
+                raise
+            raise ValidationError(errors)
+
+    def slug_errors(self):
+        """
+        Заново проверяет slug жанров и категории из запроса. Вызывается
+        после reset_slug_caches(), чтобы кеши перечитались из базы.
+        """
+        errors = {}
+        for name in ('category', 'genre'):
+            if name not in self.initial_data:
+                continue
+            try:
+                self.fields[name].run_validation(self.initial_data[name])
+            except ValidationError as error:
+                errors[name] = error.detail
+        return errors
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -148,10 +172,50 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ['id', 'author', 'score', 'text', 'title', 'pub_date']
         model = Review
 
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_review_by_author,
+        # Review.save выполняет вставку в отдельной транзакции.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже оставляли отзыв на это произведение!'
+                ]
+            })
+
+
+class ModerationSerializer(serializers.Serializer):
+    """
+    Массовое действие над отзывами или комментариями: отбор по списку id
+    и (или) по автору, произведению и интервалу дат публикации.
+    """
+    DELETE = 'delete'
+    EDIT = 'edit'
+    FILTER_FIELDS = (
+        'ids', 'author', 'title', 'pub_date_after', 'pub_date_before'
+    )
+
+    action = serializers.ChoiceField(choices=(DELETE, EDIT))
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False, allow_empty=False
+    )
+    author = serializers.SlugRelatedField(
+        queryset=User.objects.all(), slug_field='username', required=False
+    )
+    title = serializers.PrimaryKeyRelatedField(
+        queryset=Title.objects.all(), required=False
+    )
+    pub_date_after = serializers.DateTimeField(required=False)
+    pub_date_before = serializers.DateTimeField(required=False)
+    text = serializers.CharField(required=False)
+
     def validate(self, data):
-        if self.context['request'].method == 'POST' and Review.objects.filter(
-                title=self.context['view'].kwargs.get('title_id'),
-                author=self.context['request'].user).exists():
-            raise ValidationError('Вы уже оставляли отзыв '
-                                  'на это произведение!')
+        if not any(field in data for field in self.FILTER_FIELDS):
+            raise ValidationError(
+                'Укажите id объектов или условия отбора.'
+            )
+        if data['action'] == self.EDIT and 'text' not in data:
+            raise ValidationError({'text': ['Обязательное поле.']})
         return data
@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.signals import bulk_changed
+from .cache import (
+    CATEGORIES, COMMENTS, GENRES, REVIEWS, TITLES, USERS, invalidate
+)
+from .ngram import NGRAM_INDEXES
+from .slugs import SLUG_CACHES
+
+NGRAM_INDEX_MODELS = {Category: CATEGORIES, Genre: GENRES, User: USERS}
+SLUG_CACHE_MODELS = {Category: CATEGORIES, Genre: GENRES}
+BULK_CHANGE_GROUPS = {
+    Category: (CATEGORIES, TITLES),
+    Genre: (GENRES, TITLES),
+    Title: (TITLES,),
+    Title.genre.through: (TITLES,),
+    Review: (REVIEWS, TITLES),
+    Comment: (COMMENTS,),
+    User: (USERS,),
+}
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, **kwargs):
+    invalidate(CATEGORIES, TITLES)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    invalidate(GENRES, TITLES)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_titles(sender, **kwargs):
+    invalidate(TITLES)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviews(sender, **kwargs):
+    invalidate(REVIEWS, TITLES)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, **kwargs):
+    invalidate(COMMENTS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_users(sender, **kwargs):
+    invalidate(USERS)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=User)
+def update_ngram_index(sender, instance, **kwargs):
+    index = NGRAM_INDEXES[NGRAM_INDEX_MODELS[sender]]
+    value = getattr(instance, index.field)
+    transaction.on_commit(lambda: index.add(instance.pk, value))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=User)
+def remove_from_ngram_index(sender, instance, **kwargs):
+    index = NGRAM_INDEXES[NGRAM_INDEX_MODELS[sender]]
+    pk = instance.pk
+    transaction.on_commit(lambda: index.remove(pk))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def update_slug_cache(sender, instance, **kwargs):
+    cache = SLUG_CACHES[SLUG_CACHE_MODELS[sender]]
+    pk, slug = instance.pk, instance.slug
+    transaction.on_commit(lambda: cache.add(pk, slug))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def remove_from_slug_cache(sender, instance, **kwargs):
+    cache = SLUG_CACHES[SLUG_CACHE_MODELS[sender]]
+    pk = instance.pk
+    transaction.on_commit(lambda: cache.remove(pk))
+
+
+@receiver(bulk_changed)
+def invalidate_bulk_changes(sender, models, **kwargs):
+    """Сбрасывает кэши после массовых изменений из команд reviews."""
+    invalidate(*sorted({
+        group for model in models
+        for group in BULK_CHANGE_GROUPS.get(model, ())
+    }))
+    for model in models:
+        if model in SLUG_CACHE_MODELS:
+            transaction.on_commit(SLUG_CACHES[SLUG_CACHE_MODELS[model]].reset)
@@ -0,0 +1,145 @@
+import time
+from threading import RLock
+
+from django.conf import settings
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
+
+from reviews.models import Category, Genre
+
+from .cache import CATEGORIES, GENRES
+
+
+class SlugCache:
+    """
+    Соответствие slug -> id модели в памяти процесса. Загружается одним
+    запросом, обновляется сигналами и целиком перечитывается раз
+    в SLUG_CACHE_TTL секунд, чтобы подхватить изменения других процессов.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.lock = RLock()
+        self.ids = {}
+        self.slugs = {}
+        self.built_at = None
+
+    def build(self):
+        with self.lock:
+            self.ids, self.slugs = {}, {}
+            rows = self.model.objects.values_list('pk', 'slug')
+            for pk, slug in rows.iterator():
+                self._add(pk, slug)
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        if self.built_at is None or (
+            time.monotonic() - self.built_at >= settings.SLUG_CACHE_TTL
+        ):
+            self.build()
+
+    def _add(self, pk, slug):
+        self._remove(pk)
+        self.ids[slug] = pk
+        self.slugs[pk] = slug
+
+    def _remove(self, pk):
+        slug = self.slugs.pop(pk, None)
+        if slug is not None:
+            del self.ids[slug]
+
+    def reset(self):
+        """Помечает кеш устаревшим: следующий resolve() перечитает его."""
+        with self.lock:
+            self.built_at = None
+
+    def add(self, pk, slug):
+        with self.lock:
+            if self.built_at is not None:
+                self._add(pk, slug)
+
+    def remove(self, pk):
+        with self.lock:
+            if self.built_at is not None:
+                self._remove(pk)
+
+    def resolve(self, slugs):
+        """
+        Возвращает словарь slug -> id для найденных slug. Отсутствующие
+        в кеше slug дочитываются из базы одним запросом.
+        """
+        with self.lock:
+            self.ensure_built()
+            missing = [slug for slug in slugs if slug not in self.ids]
+            if missing:
+                rows = self.model.objects.filter(
+                    slug__in=missing
+                ).values_list('pk', 'slug')
+                for pk, slug in rows:
+                    self._add(pk, slug)
+            return {
+                slug: self.ids[slug] for slug in slugs if slug in self.ids
+            }
+
+
+SLUG_CACHES = {
+    CATEGORIES: SlugCache(Category),
+    GENRES: SlugCache(Genre),
+}
+
+
+def reset_slug_caches():
+    for cache in SLUG_CACHES.values():
+        cache.reset()
+
+
+class CachedSlugManyRelatedField(ManyRelatedField):
+    """Список slug, который разрешается в объекты за одно обращение."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_instances(data)
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который находит id по slug в SLUG_CACHES, а не
+    запросом к базе. Возвращает объекты модели с загруженными только
+    pk и slug, остальные поля отложены.
+    """
+
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(slug_field='slug', **kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return CachedSlugManyRelatedField(**list_kwargs)
+
+    def to_instances(self, slugs):
+        if not all(isinstance(slug, str) for slug in slugs):
+            self.fail('invalid')
+        ids = SLUG_CACHES[self.cache].resolve(slugs)
+        queryset = self.get_queryset()
+        instances = []
+        for slug in slugs:
+            if slug not in ids:
+                self.fail(
+                    'does_not_exist',
+                    slug_name=self.slug_field, value=smart_str(slug)
+                )
+            instances.append(queryset.model.from_db(
+                queryset.db, ['id', 'slug'], [ids[slug], slug]
+            ))
+        return instances
+
+    def to_internal_value(self, data):
+        return self.to_instances([data])[0]
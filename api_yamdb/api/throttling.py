@@ -0,0 +1,116 @@
+from math import ceil
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import ScopedRateThrottle
+
+_stores = {}
+_stores_lock = Lock()
+
+
+def take_token(state, capacity, refill_rate, now):
+    """
+    Пополняет корзину за прошедшее время и забирает из неё токен.
+    Возвращает новое состояние (токены, время), признак разрешения
+    и время ожидания следующего токена в секундах.
+    """
+    tokens, updated_at = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+    if tokens >= 1:
+        return (tokens - 1, now), True, 0
+    return (tokens, now), False, (1 - tokens) / refill_rate
+
+
+class LocalBucketStore:
+    """
+    Корзины в памяти процесса. Подходит для тестов и одного процесса:
+    у каждого процесса свой лимит, а записи не удаляются.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.buckets = {}
+
+    def consume(self, key, capacity, refill_rate, now):
+        with self.lock:
+            self.buckets[key], allowed, wait = take_token(
+                self.buckets.get(key), capacity, refill_rate, now
+            )
+        return allowed, wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Корзины в кэше THROTTLE_CACHE_ALIAS, общие для всех процессов.
+    Чтение и запись не атомарны, поэтому при одновременных запросах
+    лимит может быть превышен на несколько запросов.
+    Запись живёт, пока корзина не наполнится заново.
+    """
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def consume(self, key, capacity, refill_rate, now):
+        state, allowed, wait = take_token(
+            self.cache.get(key), capacity, refill_rate, now
+        )
+        self.cache.set(key, state, ceil(capacity / refill_rate))
+        return allowed, wait
+
+    def clear(self):
+        """Корзины в общем кэше сбрасываются вместе с кэшем."""
+
+
+def get_bucket_store():
+    """Возвращает хранилище корзин из настройки THROTTLE_BUCKET_STORE."""
+    path = settings.THROTTLE_BUCKET_STORE
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = import_string(path)()
+        return _stores[path]
+
+
+class TokenBucketThrottle(ScopedRateThrottle):
+    """
+    Ограничение запросов к представлению с throttle_scope по алгоритму
+    token bucket: корзина вмещает N запросов из частоты 'N/период'
+    в DEFAULT_THROTTLE_RATES и пополняется равномерно. Корзина своя
+    у каждого пользователя, а для анонимных запросов — у каждого IP.
+    """
+
+    def get_rate(self):
+        # Частоты читаются при каждом запросе, чтобы учитывать
+        # изменения настроек, в отличие от SimpleRateThrottle.
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f'No default throttle rate set for {self.scope!r} scope'
+            )
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+        allowed, self.wait_seconds = get_bucket_store().consume(
+            self.get_cache_key(request, view),
+            self.num_requests,
+            self.num_requests / self.duration,
+            self.timer(),
+        )
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
@@ -5,6 +5,9 @@ from .views import (
     UserRegisterAPIView,
     TokenValidationAPIView,
     UserListViewSet,
+    DataExportAPIView,
+    CommentModerationAPIView,
+    ReviewModerationAPIView,
     CategoryViewSet,
     CommentViewSet,
     GenreViewSet,
@@ -45,6 +48,19 @@ urlpatterns = [
                 'auth/token/',
                 TokenValidationAPIView.as_view(), name='auth'
             ),
+            path(
+                'export/<slug:name>.<slug:file_format>',
+                DataExportAPIView.as_view(), name='export'
+            ),
+            path(
+                'moderation/reviews/',
+                ReviewModerationAPIView.as_view(), name='moderation-reviews'
+            ),
+            path(
+                'moderation/comments/',
+                CommentModerationAPIView.as_view(),
+                name='moderation-comments'
+            ),
         ])
     ),
     path(f'{API_VERSION_1}/', include(router_v1.urls)),
@@ -1,11 +1,13 @@
-from django.db.models import Avg
-from django.core.mail import send_mail
+from pathlib import Path
+
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
-from rest_framework import filters, status, viewsets, views
+from rest_framework import status, viewsets, views
 from rest_framework.decorators import action
-from rest_framework.pagination import (LimitOffsetPagination)
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
@@ -18,16 +20,41 @@ from rest_framework.mixins import (
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from django_filters.rest_framework import DjangoFilterBackend
 
-from reviews.models import Category, Genre, Title, User, Review
+from reviews.csv_data import (
+    CSV_FILES, EXPORT_FORMATS, export_lines, export_rows
+)
+from reviews.constants import ADMIN_ROLE, MODERATOR_ROLE
+from reviews.models import Category, Comment, Genre, Title, User, Review
+from reviews.outbox import enqueue_email
 from .permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
     IsAuthorModeratorAdminOrReadOnly)
+from .cache import (
+    CATEGORIES,
+    COMMENTS,
+    GENRES,
+    REVIEWS,
+    TITLES,
+    USERS,
+    CatalogCacheMixin,
+    ConditionalGetMixin,
+    invalidate
+)
+from .bulk import bulk_save_titles
 from .filters import TitleFilter
+from .ngram import NgramSearchFilter
+from .pagination import (
+    LimitOffsetOrCursorPagination,
+    PageNumberOrCursorPagination
+)
+from .parsers import NDJSONParser
+from .throttling import TokenBucketThrottle
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
+    ModerationSerializer,
     ReviewSerializer,
     TitleReadSerializer,
     TitleEditSerializer,
@@ -39,6 +66,8 @@ from .serializers import (
 
 class UserRegisterAPIView(views.APIView):
     permission_classes = [IsAdmin]
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'signup'
 
     def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
@@ -57,16 +86,16 @@ class UserRegisterAPIView(views.APIView):
         return default_token_generator.make_token(user)
 
     def send_confirmation_code(self, email, confirmation_code):
-        send_mail(
+        enqueue_email(
             subject='Confirmation Code',
             message=f'Your confirmation code: {confirmation_code}',
-            from_email='noreply@example.com',
-            recipient_list=[email],
-            fail_silently=False,
+            recipient=email,
         )
 
 
 class TokenValidationAPIView(views.APIView):
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'token'
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
@@ -78,13 +107,123 @@ class TokenValidationAPIView(views.APIView):
         return Response(token, status=status.HTTP_200_OK)
 
 
-class UserListViewSet(viewsets.ModelViewSet):
+class DataExportAPIView(views.APIView):
+    """Потоковая выгрузка таблицы в CSV или JSONL для администратора."""
+    permission_classes = (IsAuthenticated, IsAdmin)
+    export_files = {
+        Path(filename).stem: (model, columns)
+        for filename, model, columns in CSV_FILES
+    }
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'jsonl': 'application/x-ndjson; charset=utf-8',
+    }
+
+    def get(self, request, name, file_format):
+        if name not in self.export_files or file_format not in EXPORT_FORMATS:
+            raise Http404
+        model, columns = self.export_files[name]
+        response = StreamingHttpResponse(
+            export_lines(columns, export_rows(model, columns), file_format),
+            content_type=self.content_types[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{file_format}"'
+        )
+        return response
+
+
+def delete_without_signals(queryset):
+    """
+    Удаляет строки одним DELETE через приватный QuerySet._raw_delete:
+    без каскада и сигналов pre_delete/post_delete. Зависимые строки,
+    пересчёт рейтинга и сброс кэша вызывающий делает сам.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+class ModerationAPIView(views.APIView):
+    """
+    Массовое удаление и правка объектов набором запросов. Модераторы
+    и администраторы работают со всеми объектами, остальные — только
+    со своими, как в IsAuthorModeratorAdminOrReadOnly.
+    """
+    permission_classes = (IsAuthenticated,)
+    model = None
+    title_lookup = None
+    cache_groups = ()
+
+    def get_queryset(self, data):
+        lookups = {}
+        if 'ids' in data:
+            lookups['pk__in'] = data['ids']
+        if 'author' in data:
+            lookups['author'] = data['author']
+        if 'title' in data:
+            lookups[self.title_lookup] = data['title']
+        if 'pub_date_after' in data:
+            lookups['pub_date__gte'] = data['pub_date_after']
+        if 'pub_date_before' in data:
+            lookups['pub_date__lte'] = data['pub_date_before']
+        return self.model.objects.filter(**lookups)
+
+    def check_queryset_permissions(self, queryset):
+        user = self.request.user
+        if user.role in (MODERATOR_ROLE, ADMIN_ROLE):
+            return
+        if queryset.exclude(author=user).exists():
+            self.permission_denied(self.request)
+
+    def perform_delete(self, queryset):
+        return delete_without_signals(queryset)
+
+    def post(self, request):
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        queryset = self.get_queryset(data)
+        with transaction.atomic():
+            self.check_queryset_permissions(queryset)
+            if data['action'] == ModerationSerializer.DELETE:
+                count = self.perform_delete(queryset)
+            else:
+                count = queryset.update(text=data['text'])
+            # Массовые запросы не отправляют сигналы моделей.
+            invalidate(*self.cache_groups)
+        return Response({'action': data['action'], 'count': count})
+
+
+class ReviewModerationAPIView(ModerationAPIView):
+    model = Review
+    title_lookup = 'title'
+    cache_groups = (REVIEWS, COMMENTS, TITLES)
+
+    def perform_delete(self, queryset):
+        title_ids = list(
+            queryset.order_by().values_list('title_id', flat=True).distinct()
+        )
+        # Вместо каскада и сигнала пересчёта рейтинга при удалении.
+        delete_without_signals(Comment.objects.filter(review__in=queryset))
+        count = super().perform_delete(queryset)
+        Title.objects.filter(pk__in=title_ids).recalculate_rating()
+        return count
+
+
+class CommentModerationAPIView(ModerationAPIView):
+    model = Comment
+    title_lookup = 'review__title'
+    cache_groups = (COMMENTS,)
+
+
+class UserListViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     '''Профиль пользователя'''
+    etag_groups = (USERS,)
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated, IsAdmin)
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (NgramSearchFilter,)
     search_fields = ('username',)
+    search_index = USERS
     http_method_names = ['get', 'post', 'delete', 'patch']
     lookup_field = 'username'
     lookup_value_regex = r'[\w\@\.\+\-]+'
@@ -121,74 +260,127 @@ class CreateListDestroyMixin(
     pass
 
 
-class CategoryViewSet(CreateListDestroyMixin):
+class CategoryViewSet(
+    ConditionalGetMixin, CatalogCacheMixin, CreateListDestroyMixin
+):
     """Представление для работы с моделью Category."""
+    cache_group = CATEGORIES
+    etag_groups = (CATEGORIES,)
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (NgramSearchFilter,)
     search_fields = ('name',)
+    search_index = CATEGORIES
     lookup_field = 'slug'
 
 
-class GenreViewSet(CreateListDestroyMixin):
+class GenreViewSet(
+    ConditionalGetMixin, CatalogCacheMixin, CreateListDestroyMixin
+):
     '''Жанры'''
+    cache_group = GENRES
+    etag_groups = (GENRES,)
     queryset = Genre.objects.all().order_by('id')
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (NgramSearchFilter,)
     search_fields = ('name',)
+    search_index = GENRES
     lookup_field = 'slug'
 
 
-class TitleViewSet(ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('rating')
+class TitleViewSet(ConditionalGetMixin, CatalogCacheMixin, ModelViewSet):
+    cache_group = TITLES
+    etag_groups = (TITLES,)
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    pagination_class = PageNumberOrCursorPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
 
+    def get_queryset(self):
+        queryset = Title.objects.order_by('rating', 'id')
+        if self.action == 'destroy':
+            return queryset
+        return queryset.select_related('category').prefetch_related('genre')
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitleEditSerializer
 
+    @action(
+        methods=['POST'], detail=False, url_path='bulk',
+        parser_classes=(JSONParser, NDJSONParser)
+    )
+    def bulk(self, request):
+        """
+        Создаёт и обновляет пакет произведений из JSON-массива или NDJSON.
+        """
+        results, saved = bulk_save_titles(
+            request.data, self.get_serializer_context()
+        )
+        return Response(
+            results,
+            status=(
+                status.HTTP_201_CREATED if saved
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Представление для работы с моделью Comment."""
+    etag_groups = (COMMENTS, REVIEWS, USERS)
 
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get('review_id'))
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id')
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related(
+            'author'
+        ).order_by('pub_date', 'id')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user,
-                        review_id=self.get_review().id)
+        serializer.save(author=self.request.user, review=self.get_review())
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Представление для работы с моделью Review."""
+    etag_groups = (REVIEWS, TITLES, USERS)
 
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        # title подставляет связанный менеджер, author загружается JOIN.
+        return self.get_title().reviews.select_related(
+            'author'
+        ).order_by('pub_date', 'id')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user,
-                        title_id=self.get_title().id)
+        serializer.save(author=self.request.user, title=self.get_title())
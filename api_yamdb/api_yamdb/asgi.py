@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
 application = get_asgi_application()
+
+from api.ngram import build_indexes_in_background  # noqa: E402
+
+build_indexes_in_background()
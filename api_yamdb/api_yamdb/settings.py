@@ -46,6 +46,10 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '5/min',
+        'token': '10/min',
+    },
 }
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -80,6 +84,62 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Кэш ответов каталога сбрасывается сменой версии группы в CACHES.
+# Сброс виден другим процессам только при общем бэкенде (Redis, Memcached);
+# с LocMemCache каждый процесс держит свою копию, и после записи в другом
+# процессе ответы остаются устаревшими до истечения CATALOG_CACHE_TIMEOUT.
+CATALOG_CACHE_ALIAS = 'default'
+
+# Срок хранения тел ответов; версии групп (и ETag) в общем кэше бессрочны.
+CATALOG_CACHE_TIMEOUT = 60
+
+# ETag и ответы 304 для каталога: None - только при общем бэкенде кэша,
+# True/False - принудительно (True допустим лишь для одного процесса).
+CATALOG_CACHE_ETAGS = None
+
+# Хранилище корзин ограничения запросов: в памяти процесса
+# (api.throttling.LocalBucketStore) или в общем кэше.
+THROTTLE_BUCKET_STORE = 'api.throttling.CacheBucketStore'
+
+THROTTLE_CACHE_ALIAS = 'default'
+
+
+# Search
+
+# Путь к классу бэкенда поиска по произведениям; если не задан,
+# бэкенд выбирается по СУБД (FTS5 для SQLite, tsvector для PostgreSQL).
+TITLE_SEARCH_BACKEND = None
+
+# Индексы н-грамм для поиска по жанрам, категориям и пользователям:
+# период полной перестройки в секундах и порог сходства при опечатках.
+NGRAM_INDEX_TTL = 300
+
+# Строить индексы н-грамм в фоновом потоке, а не в запросе поиска.
+NGRAM_INDEX_BACKGROUND = True
+
+NGRAM_SIMILARITY = 0.3
+
+# Период полной перезагрузки кеша slug жанров и категорий в секундах.
+SLUG_CACHE_TTL = 300
+
+# Пакетная загрузка произведений: предельный размер пакета
+# и размер группы строк в одном INSERT/UPDATE.
+TITLES_BULK_MAX_ITEMS = 5000
+
+TITLES_BULK_BATCH_SIZE = 500
+
+# Каталог для сохранённых результатов замеров производительности.
+BENCHMARK_RESULTS_DIR = BASE_DIR / 'benchmarks'
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -121,4 +181,21 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+DEFAULT_FROM_EMAIL = 'noreply@example.com'
+
+# Доставка писем из очереди: 'thread' — фоновым потоком после запроса
+# (повторы планируются таймером в том же процессе), 'worker' — командой
+# send_emails --loop, 'immediate' — сразу после транзакции.
+EMAIL_OUTBOX_DELIVERY = 'thread'
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+
+# Наибольшее время ожидания неполной группы писем в секундах.
+EMAIL_OUTBOX_FLUSH_INTERVAL = 1.0
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# Задержка перед повтором в секундах, удваивается с каждой попыткой.
+EMAIL_OUTBOX_RETRY_DELAY = 60
+
 AUTH_USER_MODEL = 'reviews.User'
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
 application = get_wsgi_application()
+
+from api.ngram import build_indexes_in_background  # noqa: E402
+
+build_indexes_in_background()
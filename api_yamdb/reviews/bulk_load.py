@@ -0,0 +1,43 @@
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import connection
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Не даёт bulk_create перезаписать заданные даты текущим временем."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def bulk_insert(model, objects, batch_size):
+    """
+    Вставляет объекты из итератора группами по batch_size, не держа
+    их все в памяти. Возвращает количество вставленных строк.
+    """
+    objects = iter(objects)
+    count = 0
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return count
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        count += len(batch)
+
+
+def reset_sequences(models):
+    """Сдвигает последовательности id после вставки строк с явными id."""
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
@@ -23,3 +23,4 @@ MAX_LENGTH_SLUG = 50
 MAX_LENGTH_GENRE_CATEGORY_NAME = 256
 MAX_LENGTH_TITLE_NAME = 256
 MAX_LENGTH_TITLE_DESCRIPTION = 256
+MAX_LENGTH_EMAIL_SUBJECT = 256
@@ -0,0 +1,79 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Category, Comment, Genre, Review, Title, User
+
+CSV_DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+# Файлы в порядке зависимостей: модель и колонки файла.
+CSV_FILES = (
+    ('users.csv', User, (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    )),
+    ('category.csv', Category, ('id', 'name', 'slug')),
+    ('genre.csv', Genre, ('id', 'name', 'slug')),
+    ('titles.csv', Title, ('id', 'name', 'year', 'category')),
+    ('genre_title.csv', Title.genre.through, ('id', 'title_id', 'genre_id')),
+    ('review.csv', Review, (
+        'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+    )),
+    ('comments.csv', Comment, (
+        'id', 'review_id', 'text', 'author', 'pub_date'
+    )),
+)
+
+# Колонки, которые в файлах называются иначе, чем поля модели.
+CSV_COLUMN_FIELDS = {
+    'category': 'category_id',
+    'author': 'author_id',
+}
+
+
+def column_field(model, column):
+    """Возвращает поле модели, которому соответствует колонка файла."""
+    attname = CSV_COLUMN_FIELDS.get(column, column)
+    return next(
+        field for field in model._meta.concrete_fields
+        if field.attname == attname
+    )
+
+
+class Echo:
+    """Буфер для csv.writer, который просто возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(model, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Построчно читает таблицу, не загружая её в память целиком."""
+    attnames = [column_field(model, column).attname for column in columns]
+    return model.objects.order_by('pk').values_list(*attnames).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def export_lines(columns, rows, file_format):
+    """Превращает строки таблицы в строки файла CSV или JSONL."""
+    encoder = DjangoJSONEncoder()
+
+    def prepare(value):
+        if value is None or isinstance(value, (int, str)):
+            return value
+        return encoder.default(value)
+
+    if file_format == 'jsonl':
+        for row in rows:
+            yield json.dumps(
+                dict(zip(columns, map(prepare, row))), ensure_ascii=False
+            ) + '\n'
+        return
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(map(prepare, row))
@@ -0,0 +1,199 @@
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Max
+
+from .bulk_load import bulk_insert, keep_auto_now_add, reset_sequences
+from .models import Category, Comment, Genre, Review, Title, User
+from .search import get_search_backend
+
+# Доли оценок от 1 до 10: зрители чаще ставят высокие оценки.
+SCORE_WEIGHTS = (2, 1, 2, 3, 5, 8, 12, 16, 14, 10)
+MAX_TITLE_GENRES = 3
+PUB_DATE_DAYS = 5 * 365
+# Момент, от которого отсчитываются даты публикаций и год выпуска:
+# с постоянным моментом один seed всегда даёт одинаковые данные.
+REFERENCE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DATASET_MODELS = (User, Category, Genre, Title, Review, Comment)
+
+
+def zipf_weights(count, exponent):
+    """Веса 1 / rank ** exponent: немногие элементы получают большую долю."""
+    return [1 / rank ** exponent for rank in range(1, count + 1)]
+
+
+def next_id(model):
+    return (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+
+class DatasetGenerator:
+    """
+    Детерминированный по seed синтетический набор данных. Популярность
+    произведений и отзывов распределена по закону Ципфа с показателем
+    skew: у немногих произведений тысячи отзывов, у длинного хвоста
+    отзывов нет совсем.
+    Строки вставляются группами по batch_size с явными id, поэтому
+    набор можно добавлять к уже заполненной базе. Даты публикаций лежат
+    в пределах PUB_DATE_DAYS до момента now.
+    """
+
+    def __init__(self, seed=0, skew=1.2, batch_size=1000,
+                 now=REFERENCE_TIME):
+        self.random = random.Random(seed)
+        self.skew = skew
+        self.batch_size = batch_size
+        self.now = now
+        self.password = make_password(None)
+
+    def insert(self, model, objects):
+        with keep_auto_now_add(model):
+            return bulk_insert(model, objects, self.batch_size)
+
+    def pub_date(self):
+        return self.now - timedelta(
+            seconds=self.random.randrange(PUB_DATE_DAYS * 24 * 3600)
+        )
+
+    def generate(self, users, categories, genres, titles, reviews,
+                 comments):
+        """Создаёт данные и возвращает количество строк по моделям."""
+        counts = {}
+        user_ids = self.generate_users(users, counts)
+        category_ids = self.generate_slugs(
+            Category, categories, counts, 'categories'
+        )
+        genre_ids = self.generate_slugs(Genre, genres, counts, 'genres')
+        title_ids = self.generate_titles(
+            titles, category_ids, genre_ids, counts
+        )
+        review_ids = self.generate_reviews(
+            reviews, title_ids, user_ids, counts
+        )
+        self.generate_comments(comments, review_ids, user_ids, counts)
+        reset_sequences([User, Category, Genre, Title, Review])
+        Title.objects.recalculate_rating()
+        get_search_backend().rebuild()
+        return counts
+
+    def generate_users(self, count, counts):
+        start = next_id(User)
+        ids = range(start, start + count)
+        counts['users'] = self.insert(User, (
+            User(
+                id=pk, username=f'user{pk}', email=f'user{pk}@example.com',
+                password=self.password
+            )
+            for pk in ids
+        ))
+        return ids
+
+    def generate_slugs(self, model, count, counts, key):
+        start = next_id(model)
+        ids = range(start, start + count)
+        name = model._meta.model_name
+        counts[key] = self.insert(model, (
+            model(id=pk, name=f'{name.title()} {pk}', slug=f'{name}-{pk}')
+            for pk in ids
+        ))
+        return ids
+
+    def generate_titles(self, count, category_ids, genre_ids, counts):
+        start = next_id(Title)
+        ids = range(start, start + count)
+        year = self.now.year
+        category_weights = list(accumulate(
+            zipf_weights(len(category_ids), self.skew)
+        ))
+        categories = self.random.choices(
+            category_ids, cum_weights=category_weights, k=count
+        ) if category_ids else [None] * count
+        counts['titles'] = self.insert(Title, (
+            Title(
+                id=pk, name=f'Произведение {pk}',
+                year=self.random.randint(1900, year),
+                category_id=category_id,
+                description=f'Описание произведения {pk}',
+            )
+            for pk, category_id in zip(ids, categories)
+        ))
+        if genre_ids:
+            through = Title.genre.through
+            counts['genre_title'] = self.insert(through, (
+                through(title_id=pk, genre_id=genre_id)
+                for pk in ids
+                for genre_id in self.random.sample(
+                    genre_ids,
+                    self.random.randint(
+                        1, min(MAX_TITLE_GENRES, len(genre_ids))
+                    )
+                )
+            ))
+        return ids
+
+    def review_counts(self, total, titles_count, users_count):
+        """
+        Распределяет total отзывов по произведениям по закону Ципфа.
+        У произведения не больше users_count отзывов — по одному
+        от каждого автора, лишние отзывы уходят следующим по рангу.
+        """
+        weights = zipf_weights(titles_count, self.skew)
+        weights_sum = sum(weights)
+        counts = [
+            min(users_count, int(total * weight / weights_sum))
+            for weight in weights
+        ]
+        remaining = total - sum(counts)
+        for rank in range(titles_count):
+            if remaining <= 0:
+                break
+            extra = min(users_count - counts[rank], remaining)
+            counts[rank] += extra
+            remaining -= extra
+        return counts
+
+    def generate_reviews(self, total, title_ids, user_ids, counts):
+        titles = list(title_ids)
+        # Популярность не должна совпадать с порядком id.
+        self.random.shuffle(titles)
+        review_counts = self.review_counts(
+            total, len(titles), len(user_ids)
+        )
+        start = next_id(Review)
+
+        def reviews():
+            pk = start
+            for title_id, count in zip(titles, review_counts):
+                for author_id in self.random.sample(user_ids, count):
+                    yield Review(
+                        id=pk, title_id=title_id, author_id=author_id,
+                        text=f'Отзыв {pk}', pub_date=self.pub_date(),
+                        score=self.random.choices(
+                            range(1, 11), weights=SCORE_WEIGHTS
+                        )[0],
+                    )
+                    pk += 1
+
+        counts['reviews'] = self.insert(Review, reviews())
+        return range(start, start + counts['reviews'])
+
+    def generate_comments(self, total, review_ids, user_ids, counts):
+        if not review_ids or not user_ids:
+            counts['comments'] = 0
+            return
+        reviews = list(review_ids)
+        self.random.shuffle(reviews)
+        review_weights = list(accumulate(
+            zipf_weights(len(reviews), self.skew)
+        ))
+        counts['comments'] = self.insert(Comment, (
+            Comment(
+                review_id=self.random.choices(
+                    reviews, cum_weights=review_weights
+                )[0],
+                author_id=self.random.choice(user_ids),
+                text='Комментарий', pub_date=self.pub_date(),
+            )
+            for _ in range(total)
+        ))
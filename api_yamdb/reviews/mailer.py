@@ -0,0 +1,131 @@
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+class MailerMetrics:
+    """Счётчики пропускной способности отправки писем."""
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.connections = 0
+        self.send_seconds = 0.0
+
+    @property
+    def messages_per_second(self):
+        if not self.send_seconds:
+            return 0.0
+        return self.sent / self.send_seconds
+
+    def as_dict(self):
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'batches': self.batches,
+            'connections': self.connections,
+            'send_seconds': round(self.send_seconds, 6),
+            'messages_per_second': round(self.messages_per_second, 2),
+        }
+
+
+class BatchMailer:
+    """
+    Копит письма из очереди и отправляет их группами через одно открытое
+    соединение: группа уходит, когда набрано batch_size писем или самое
+    старое ждёт дольше flush_interval секунд.
+
+    Ошибка при отправке группы возвращает в очередь всю группу, поэтому
+    часть писем может быть доставлена повторно.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=None):
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.flush_interval = (
+            settings.EMAIL_OUTBOX_FLUSH_INTERVAL
+            if flush_interval is None else flush_interval
+        )
+        self.connection = None
+        self.pending = []
+        self.oldest = None
+        self.metrics = MailerMetrics()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, email):
+        if not self.pending:
+            self.oldest = time.monotonic()
+        self.pending.append(email)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        if self.pending and (
+            time.monotonic() - self.oldest >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        emails, self.pending = self.pending, []
+        if not emails:
+            return 0
+        messages = [
+            EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=[email.recipient],
+            )
+            for email in emails
+        ]
+        started = time.monotonic()
+        try:
+            self.open()
+            self.connection.send_messages(messages)
+        except Exception as error:
+            self.reset_connection()
+            for email in emails:
+                email.last_error = repr(error)
+            OutboxEmail.objects.bulk_update(emails, ['last_error'])
+            self.metrics.failed += len(emails)
+            return 0
+        finally:
+            self.metrics.send_seconds += time.monotonic() - started
+            self.metrics.batches += 1
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(sent_at=timezone.now(), last_error='', message='')
+        self.metrics.sent += len(emails)
+        return len(emails)
+
+    def open(self):
+        if self.connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self.connection = connection
+            self.metrics.connections += 1
+
+    def reset_connection(self):
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.reset_connection()
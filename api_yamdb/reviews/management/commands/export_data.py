@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from reviews.csv_data import (
+    CSV_FILES, EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_lines, export_rows
+)
+
+
+class Command(BaseCommand):
+    help = 'Выгружает данные в файлы с колонками как в static/data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', type=Path, help='Каталог для выгруженных файлов.'
+        )
+        parser.add_argument(
+            '--format', dest='file_format', choices=EXPORT_FORMATS,
+            default='csv', help='Формат файлов.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за раз.'
+        )
+
+    def handle(self, *args, **options):
+        path, file_format = options['path'], options['file_format']
+        path.mkdir(parents=True, exist_ok=True)
+        for filename, model, columns in CSV_FILES:
+            filename = f'{Path(filename).stem}.{file_format}'
+            rows = export_rows(model, columns, options['chunk_size'])
+            with open(
+                path / filename, 'w', encoding='utf-8', newline=''
+            ) as export_file:
+                export_file.writelines(
+                    export_lines(columns, rows, file_format)
+                )
+            self.stdout.write(f'{filename}: выгружено.')
+        self.stdout.write(self.style.SUCCESS('Экспорт завершён.'))
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.dataset import DATASET_MODELS, REFERENCE_TIME, DatasetGenerator
+from reviews.signals import bulk_changed
+
+DEFAULT_SIZES = {
+    'users': 1000,
+    'categories': 10,
+    'genres': 30,
+    'titles': 10000,
+    'reviews': 100000,
+    'comments': 100000,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетических пользователей, произведения, отзывы '
+        'и комментарии для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_SIZES.items():
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help=f'Количество объектов {name}.'
+            )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора случайных чисел.'
+        )
+        parser.add_argument(
+            '--skew', type=float, default=1.2,
+            help='Показатель распределения Ципфа для популярности.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк в одном INSERT.'
+        )
+        parser.add_argument(
+            '--now', type=datetime.fromisoformat,
+            default=REFERENCE_TIME,
+            help=(
+                'Момент в формате ISO 8601, от которого отсчитываются '
+                'даты публикаций (по умолчанию '
+                f'{REFERENCE_TIME.isoformat()}).'
+            )
+        )
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in DEFAULT_SIZES}
+        if any(size < 0 for size in sizes.values()):
+            raise CommandError('Количество объектов не может быть меньше 0.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        now = options['now']
+        if timezone.is_naive(now):
+            now = timezone.make_aware(now, timezone.utc)
+        if now > timezone.now():
+            raise CommandError('--now не может быть в будущем.')
+        generator = DatasetGenerator(
+            options['seed'], options['skew'], options['batch_size'], now
+        )
+        with transaction.atomic():
+            counts = generator.generate(**sizes)
+            bulk_changed.send(
+                sender=self.__class__, models=DATASET_MODELS
+            )
+        for name, count in counts.items():
+            self.stdout.write(f'{name}: создано строк {count}.')
+        self.stdout.write(self.style.SUCCESS('Набор данных создан.'))
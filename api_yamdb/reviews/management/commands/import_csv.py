@@ -0,0 +1,79 @@
+import csv
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.bulk_load import bulk_insert, keep_auto_now_add, reset_sequences
+from reviews.csv_data import CSV_DATA_DIR, CSV_FILES, column_field
+from reviews.models import Title, User
+from reviews.search import get_search_backend
+from reviews.signals import bulk_changed
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', type=Path, default=CSV_DATA_DIR,
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        path, batch_size = options['path'], options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        missing = [
+            filename for filename, _, _ in CSV_FILES
+            if not (path / filename).is_file()
+        ]
+        if missing:
+            raise CommandError(
+                f'В каталоге {path} нет файлов: {", ".join(missing)}.'
+            )
+        with transaction.atomic():
+            for filename, model, columns in CSV_FILES:
+                with keep_auto_now_add(model):
+                    count = self.import_file(
+                        path / filename, model, columns, batch_size
+                    )
+                self.stdout.write(f'{filename}: загружено строк {count}.')
+            Title.objects.recalculate_rating()
+            get_search_backend().rebuild()
+            reset_sequences([model for _, model, _ in CSV_FILES])
+            bulk_changed.send(
+                sender=self.__class__,
+                models=[model for _, model, _ in CSV_FILES]
+            )
+        self.stdout.write(self.style.SUCCESS('Импорт завершён.'))
+
+    def import_file(self, path, model, columns, batch_size):
+        fields = [column_field(model, column) for column in columns]
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            reader = csv.DictReader(csv_file)
+            return bulk_insert(model, (
+                self.build_object(model, fields, columns, row)
+                for row in reader
+            ), batch_size)
+
+    @staticmethod
+    def build_object(model, fields, columns, row):
+        values = {}
+        for field, column in zip(fields, columns):
+            value = row[column]
+            if value == '' and field.null:
+                value = None
+            elif value != '':
+                value = field.to_python(value)
+            values[field.attname] = value
+        if model is User:
+            values['password'] = make_password(None)
+        return model(**values)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+from reviews.search import get_search_backend
+from reviews.signals import bulk_changed
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс произведений.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            get_search_backend().rebuild()
+            bulk_changed.send(sender=self.__class__, models=[Title])
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+from reviews.signals import bulk_changed
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает хранимый рейтинг произведений по отзывам.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.recalculate_rating()
+            bulk_changed.send(sender=self.__class__, models=[Title])
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {updated} произведений.'
+        ))
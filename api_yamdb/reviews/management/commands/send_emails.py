@@ -0,0 +1,47 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.mailer import BatchMailer
+from reviews.outbox import purge_outbox, send_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди и удаляет из неё отправленные '
+        'и исчерпавшие попытки письма.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Количество писем в одной группе отправки.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между проверками очереди в секундах.'
+        )
+        parser.add_argument(
+            '--stats', action='store_true',
+            help='Вывести метрики отправки в формате JSON.'
+        )
+
+    def handle(self, *args, **options):
+        with BatchMailer(options['batch_size']) as mailer:
+            while True:
+                purged = purge_outbox()
+                if purged:
+                    self.stdout.write(f'Удалено писем из очереди: {purged}.')
+                sent = send_pending(options['batch_size'], mailer)
+                if sent:
+                    self.stdout.write(f'Отправлено писем: {sent}.')
+                if options['stats']:
+                    self.stdout.write(json.dumps(mailer.metrics.as_dict()))
+                if not options['loop']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2024-02-12 18:40
+
+import django.contrib.auth.validators
+from django.db import migrations, models
+import reviews.validators
+
+
+def fill_title_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    totals = Review.objects.order_by().values('title').annotate(
+        total=models.Sum('score'), count=models.Count('pk')
+    )
+    for row in totals.iterator():
+        Title.objects.filter(pk=row['title']).update(
+            rating_sum=row['total'],
+            rating_count=row['count'],
+            rating=row['total'] // row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='username',
+            field=models.CharField(max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator(), reviews.validators.validate_username], verbose_name='Логин'),
+        ),
+        migrations.RunPython(fill_title_rating, migrations.RunPython.noop),
+    ]
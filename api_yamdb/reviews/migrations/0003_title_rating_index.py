@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating', 'id'], name='title_rating_id_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 16:46
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_rating_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=256, verbose_name='Тема')),
+                ('message', models.TextField(verbose_name='Текст')),
+                ('from_email', models.EmailField(max_length=254, verbose_name='Отправитель')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Следующая попытка')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попытки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'письмо в очереди',
+                'verbose_name_plural': 'Очередь писем',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(condition=models.Q(sent_at__isnull=True), fields=['next_attempt_at'], name='outbox_pending_idx'),
+        ),
+    ]
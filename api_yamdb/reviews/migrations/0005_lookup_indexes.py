@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-18 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'pub_date'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'pub_date'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'rating', 'id'], name='title_category_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# DDL записан здесь целиком, а не берётся из reviews.search: миграция
+# не должна зависеть от кода приложения и настройки TITLE_SEARCH_BACKEND.
+CREATE_SQL = {
+    'sqlite': [
+        'CREATE VIRTUAL TABLE reviews_title_fts USING fts5(name, description)',
+        'INSERT INTO reviews_title_fts (rowid, name, description) '
+        "SELECT id, name, COALESCE(description, '') FROM reviews_title",
+    ],
+    'postgresql': [
+        'CREATE INDEX title_search_idx ON reviews_title USING GIN '
+        "((to_tsvector('simple', COALESCE(name, '') || ' ' "
+        "|| COALESCE(description, ''))))",
+    ],
+}
+
+DROP_SQL = {
+    'sqlite': ['DROP TABLE IF EXISTS reviews_title_fts'],
+    'postgresql': ['DROP INDEX IF EXISTS title_search_idx'],
+}
+
+
+def run_vendor_sql(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql(CREATE_SQL), run_vendor_sql(DROP_SQL)
+        ),
+    ]
@@ -1,8 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import (MaxValueValidator,
                                     MinValueValidator)
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.utils import timezone
 
 from .constants import (
     USER_ROLE, MODERATOR_ROLE, ADMIN_ROLE,
@@ -11,6 +14,7 @@ from .constants import (
     MAX_LENGTH_TITLE_NAME, MAX_LENGTH_SLUG,
     MAX_LENGTH_TITLE_DESCRIPTION,
     MAX_LENGTH_GENRE_CATEGORY_NAME,
+    MAX_LENGTH_EMAIL_SUBJECT,
     SCORE_CHOICES
 )
 from .validators import year_validator, validate_username
@@ -109,6 +113,48 @@ class Category(GenreCategoryBaseModel):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def apply_rating_delta(self, score_delta, count_delta):
+        """
+        Сдвигает сумму и количество оценок одним UPDATE
+        и пересчитывает хранимый рейтинг.
+        """
+        new_count = F('rating_count') + count_delta
+        return self.update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=new_count,
+            rating=Case(
+                When(rating_count=-count_delta, then=None),
+                default=(F('rating_sum') + score_delta) / new_count,
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        )
+
+    def recalculate_rating(self):
+        """Пересчитывает рейтинг произведений по всем отзывам."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+        )
+        return self.update(
+            rating=Case(
+                When(rating_count=0, then=None),
+                default=F('rating_sum') / F('rating_count'),
+                output_field=models.PositiveSmallIntegerField(),
+            )
+        )
+
+
 class Title(models.Model):
     name = models.CharField(
         verbose_name='Название произведения',
@@ -137,10 +183,48 @@ class Title(models.Model):
         blank=True,
         null=True
     )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        blank=True,
+        null=True,
+        editable=False
+    )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    RATING_FIELDS = ('rating', 'rating_sum', 'rating_count')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['rating', 'id'], name='title_rating_id_idx'),
+            models.Index(
+                fields=['category', 'rating', 'id'],
+                name='title_category_rating_idx'
+            ),
+            models.Index(fields=['year'], name='title_year_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Рейтинг ведут отзывы, сохранение произведения его не затирает.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -164,6 +248,38 @@ class Review(ReviewCommentBaseModel):
                 fields=['title', 'author'],
                 name='unique_review_by_author'
             )]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date'], name='review_title_pub_date_idx'
+            ),
+        ]
+
+    def lock_rating(self):
+        """
+        Блокирует строку отзыва и возвращает сохранённые в базе
+        произведение и оценку, либо None для ещё не сохранённого отзыва.
+
+        Вызывается внутри транзакции: параллельные изменения того же отзыва
+        ждут её завершения, поэтому дельта рейтинга считается от актуальных
+        значений, а не от прочитанных до начала запроса.
+        """
+        if self._state.adding or self.pk is None:
+            return None
+        return Review.objects.select_for_update().filter(
+            pk=self.pk
+        ).values_list('title_id', 'score').first()
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            self._locked_rating = self.lock_rating()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            locked = self.lock_rating()
+            if locked is not None:
+                self.title_id, self.score = locked
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f'Отзыв на "{self.title}" от {self.author.username}'
@@ -178,6 +294,42 @@ class Comment(ReviewCommentBaseModel):
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Коментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField('Тема', max_length=MAX_LENGTH_EMAIL_SUBJECT)
+    message = models.TextField('Текст')
+    from_email = models.EmailField(
+        'Отправитель', max_length=MAX_LENGTH_EMAIL
+    )
+    recipient = models.EmailField('Получатель', max_length=MAX_LENGTH_EMAIL)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    sent_at = models.DateTimeField('Дата отправки', blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                name='outbox_pending_idx',
+                condition=models.Q(sent_at__isnull=True)
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {self.recipient}'
@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Lock, Timer
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .mailer import BatchMailer
+from .models import OutboxEmail
+
+DELIVERY_IMMEDIATE = 'immediate'
+DELIVERY_THREAD = 'thread'
+DELIVERY_WORKER = 'worker'
+# Наименьшая пауза перед повтором, чтобы письма, занятые другим
+# обработчиком, не запускали отправку в цикле.
+MIN_RETRY_DELAY = 0.1
+
+_executor = None
+_executor_lock = Lock()
+_retry_timer = None
+_retry_at = None
+
+
+def enqueue_email(subject, message, recipient, from_email=None):
+    """
+    Ставит письмо в очередь и планирует отправку после фиксации транзакции.
+    """
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipient=recipient,
+    )
+    delivery = settings.EMAIL_OUTBOX_DELIVERY
+    if delivery == DELIVERY_IMMEDIATE:
+        transaction.on_commit(send_pending)
+    elif delivery == DELIVERY_THREAD:
+        transaction.on_commit(
+            lambda: get_executor().submit(send_pending_in_thread)
+        )
+    return email
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='email-outbox'
+            )
+    return _executor
+
+
+def send_pending_in_thread():
+    close_old_connections()
+    try:
+        purge_outbox()
+        send_pending()
+        schedule_retry()
+    finally:
+        connection.close()
+
+
+def schedule_retry():
+    """
+    Планирует отправку в фоновом потоке к сроку ближайшей повторной попытки,
+    чтобы неудачные письма не ждали следующей регистрации.
+    """
+    global _retry_timer, _retry_at
+    retry_at = OutboxEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    ).aggregate(retry_at=Min('next_attempt_at'))['retry_at']
+    if retry_at is None:
+        return
+    with _executor_lock:
+        if _retry_timer is not None and _retry_timer.is_alive():
+            if _retry_at <= retry_at:
+                return
+            _retry_timer.cancel()
+        delay = (retry_at - timezone.now()).total_seconds()
+        _retry_timer = Timer(
+            max(delay, MIN_RETRY_DELAY),
+            lambda: get_executor().submit(send_pending_in_thread)
+        )
+        _retry_timer.daemon = True
+        _retry_at = retry_at
+        _retry_timer.start()
+
+
+def purge_outbox():
+    """
+    Удаляет отправленные письма и письма, исчерпавшие попытки: в тексте
+    писем лежат коды подтверждения. Возвращает количество удалённых писем.
+    """
+    deleted, _ = OutboxEmail.objects.filter(
+        Q(sent_at__isnull=False) | Q(
+            attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            next_attempt_at__lte=timezone.now(),
+        )
+    ).delete()
+    return deleted
+
+
+def claim_pending(batch_size):
+    """
+    Забирает письма, готовые к отправке, и откладывает их следующую попытку,
+    чтобы параллельный обработчик не отправил их повторно.
+    """
+    now = timezone.now()
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(
+                skip_locked=skip_locked
+            ).filter(
+                sent_at__isnull=True,
+                next_attempt_at__lte=now,
+                attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            ).order_by('next_attempt_at')[:batch_size]
+        )
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt_at = now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+                * 2 ** (email.attempts - 1)
+            )
+        OutboxEmail.objects.bulk_update(
+            emails, ['attempts', 'next_attempt_at']
+        )
+    return emails
+
+
+def send_pending(batch_size=None, mailer=None):
+    """
+    Отправляет письма из очереди через BatchMailer. Неудачные письма
+    остаются в очереди до следующей попытки.
+    Возвращает количество отправленных писем.
+    """
+    if mailer is None:
+        with BatchMailer(batch_size) as mailer:
+            return send_pending(batch_size, mailer)
+    sent_before = mailer.metrics.sent
+    while True:
+        emails = claim_pending(batch_size or mailer.batch_size)
+        if not emails:
+            break
+        for email in emails:
+            mailer.add(email)
+    mailer.flush()
+    return mailer.metrics.sent - sent_before
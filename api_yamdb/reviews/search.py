@@ -0,0 +1,162 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def search_terms(query):
+    """Разбивает поисковую строку на слова без служебных символов."""
+    return WORD_PATTERN.findall(query.lower())
+
+
+class BaseSearchBackend:
+    """
+    Полнотекстовый поиск по названию и описанию произведения.
+    search() отбирает подходящие произведения и добавляет аннотацию
+    search_rank: чем меньше значение, тем выше релевантность.
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def empty(self, queryset):
+        return queryset.none().annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def index(self, title):
+        """Обновляет запись произведения в поисковом индексе."""
+
+    def index_many(self, titles):
+        """Обновляет записи нескольких произведений."""
+        for title in titles:
+            self.index(title)
+
+    def remove(self, title_id):
+        """Удаляет произведение из поискового индекса."""
+
+    def rebuild(self):
+        """Перестраивает поисковый индекс по всем произведениям."""
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Поиск без индекса: все слова по вхождению без учёта регистра."""
+
+    def search(self, queryset, query):
+        for term in search_terms(query):
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """Индекс на виртуальной таблице FTS5, rowid совпадает с id."""
+    table = 'reviews_title_fts'
+    # Веса колонок name и description для bm25.
+    weights = (10.0, 1.0)
+
+    def match_query(self, query):
+        # Каждое слово в кавычках и с * — поиск по префиксу.
+        return ' '.join(f'"{term}"*' for term in search_terms(query))
+
+    def search(self, queryset, query):
+        match = self.match_query(query)
+        if not match:
+            return self.empty(queryset)
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            (match,)
+        )).annotate(search_rank=RawSQL(
+            f'SELECT bm25({self.table}, %s, %s) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s '
+            f'AND {self.table}.rowid = reviews_title.id',
+            (*self.weights, match), output_field=FloatField()
+        ))
+
+    index_sql = (
+        f'INSERT OR REPLACE INTO {table} (rowid, name, description) '
+        'VALUES (%s, %s, %s)'
+    )
+
+    def index(self, title):
+        self.index_many([title])
+
+    def index_many(self, titles):
+        with connection.cursor() as cursor:
+            cursor.executemany(self.index_sql, [
+                (title.pk, title.name, title.description or '')
+                for title in titles
+            ])
+
+    def remove(self, title_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', (title_id,)
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, name, description) '
+                "SELECT id, name, COALESCE(description, '') "
+                'FROM reviews_title'
+            )
+
+
+class PostgreSQLSearchBackend(BaseSearchBackend):
+    """
+    Поиск по выражению tsvector, которое покрыто GIN-индексом
+    title_search_idx (миграция 0006), поэтому отдельная синхронизация
+    не нужна. Выражение должно совпадать с индексным.
+    """
+    vector = (
+        "to_tsvector('simple', COALESCE(reviews_title.name, '') || ' ' "
+        "|| COALESCE(reviews_title.description, ''))"
+    )
+    # Для ранжирования название весит больше описания.
+    rank_vector = (
+        "setweight(to_tsvector('simple', "
+        "COALESCE(reviews_title.name, '')), 'A') || "
+        "setweight(to_tsvector('simple', "
+        "COALESCE(reviews_title.description, '')), 'D')"
+    )
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return self.empty(queryset)
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(RawSQL(
+            f"{self.vector} @@ to_tsquery('simple', %s)",
+            (tsquery,), output_field=BooleanField()
+        )).annotate(search_rank=RawSQL(
+            f"-ts_rank({self.rank_vector}, to_tsquery('simple', %s))",
+            (tsquery,), output_field=FloatField()
+        ))
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend(vendor=None):
+    """
+    Возвращает бэкенд из настройки TITLE_SEARCH_BACKEND,
+    а если она пуста — подходящий для СУБД.
+    """
+    if settings.TITLE_SEARCH_BACKEND:
+        return import_string(settings.TITLE_SEARCH_BACKEND)()
+    return VENDOR_BACKENDS.get(
+        vendor or connection.vendor, SimpleSearchBackend
+    )()
@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import Review, Title
+from .search import get_search_backend
+
+# Отправляется командами, которые меняют данные массовыми запросами
+# без сигналов моделей. Аргумент models — изменённые модели.
+bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    """Обновляет рейтинг произведения при создании и изменении отзыва."""
+    title_id, score = instance.title_id, instance.score
+    if created:
+        Title.objects.filter(pk=title_id).apply_rating_delta(score, 1)
+    else:
+        locked = getattr(instance, '_locked_rating', None)
+        if locked is None:
+            Title.objects.filter(pk=title_id).recalculate_rating()
+            return
+        old_title_id, old_score = locked
+        if old_title_id != title_id:
+            Title.objects.filter(pk=old_title_id).apply_rating_delta(
+                -old_score, -1
+            )
+            Title.objects.filter(pk=title_id).apply_rating_delta(score, 1)
+        elif old_score != score:
+            Title.objects.filter(pk=title_id).apply_rating_delta(
+                score - old_score, 0
+            )
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Вычитает оценку удалённого отзыва из рейтинга произведения."""
+    Title.objects.filter(pk=instance.title_id).apply_rating_delta(
+        -instance.score, -1
+    )
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    """Обновляет произведение в поисковом индексе."""
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_index(sender, instance, **kwargs):
+    """Удаляет произведение из поискового индекса."""
+    get_search_backend().remove(instance.pk)
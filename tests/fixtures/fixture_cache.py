@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import caches
+
+from api.ngram import NGRAM_INDEXES
+from api.slugs import SLUG_CACHES
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(settings):
+    for cache in caches.all():
+        cache.clear()
+    # База очищается между тестами, поэтому индексы строятся заново,
+    # и в тестах — в потоке запроса.
+    settings.NGRAM_INDEX_BACKGROUND = False
+    for index in (*NGRAM_INDEXES.values(), *SLUG_CACHES.values()):
+        index.reset()
@@ -0,0 +1,9 @@
+import pytest
+
+from api.throttling import get_bucket_store
+
+
+@pytest.fixture(autouse=True)
+def local_throttle_buckets(settings):
+    settings.THROTTLE_BUCKET_STORE = 'api.throttling.LocalBucketStore'
+    get_bucket_store().clear()
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, client, admin_client, admin,
+                                       user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при изменении оценки в отзыве.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при удалении отзыва.'
+        )
+
+        user.delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Если у произведения не осталось отзывов - '
+            'значением поля `rating` должно быть `None`.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_02_recalculate_ratings_command(self, client, admin_client,
+                                            admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating=None, rating_sum=0, rating_count=0)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating, title.rating_sum, title.rating_count) == (
+            5, 10, 2
+        ), (
+            'Проверьте, что команда `recalculate_ratings` пересчитывает '
+            'рейтинг произведений по отзывам.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_03_rating_with_stale_instances(self, admin_client, admin,
+                                            user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        first = Review.objects.get(pk=reviews[0]['id'])
+        second = Review.objects.get(pk=reviews[0]['id'])
+
+        first.score = 9
+        first.save()
+        second.score = 7
+        second.save()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 2), (
+            'Проверьте, что изменение отзыва, загруженного до другого '
+            'изменения, считает дельту рейтинга от сохранённой оценки.'
+        )
+
+        first.delete()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating, title.rating_sum, title.rating_count) == (
+            5, 5, 1
+        ), (
+            'Проверьте, что удаление устаревшего экземпляра отзыва '
+            'вычитает сохранённую в базе оценку.'
+        )
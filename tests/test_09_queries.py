@@ -0,0 +1,175 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+def create_catalog(titles_count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(3)
+    )
+    titles = []
+    for idx in range(titles_count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(Genre.objects.all())
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Queries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.mark.parametrize('titles_count', (1, 5, 10))
+    def test_01_titles_list_queries(self, client, django_assert_num_queries,
+                                    titles_count):
+        create_catalog(titles_count)
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == titles_count, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` '
+            'возвращает все произведения страницы.'
+        )
+
+    def test_02_titles_detail_queries(self, client,
+                                      django_assert_num_queries):
+        titles = create_catalog(1)
+        with django_assert_num_queries(2):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0].id)
+            )
+        assert len(response.json()['genre']) == 3
+
+    def test_03_titles_patch_queries(self, admin_client, admin,
+                                     django_assert_max_num_queries):
+        titles = create_catalog(1)
+        # Запись произведения и его жанров идёт в одной транзакции (BEGIN).
+        with django_assert_max_num_queries(7):
+            response = admin_client.patch(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0].id),
+                data={'name': 'Новое название'}
+            )
+        data = response.json()
+        assert data['name'] == 'Новое название'
+        assert 'rating' in data and len(data['genre']) == 3, (
+            'Проверьте, что ответ на PATCH-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` содержит рейтинг и жанры.'
+        )
+
+    def test_04_nested_parent_lookup(self, client, user_client, user,
+                                     django_assert_num_queries):
+        first, second = create_catalog(2)
+        review = Review.objects.create(
+            title=first, author=user, text='Текст', score=5
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=first.id, review_id=review.id
+        )
+        with django_assert_num_queries(3):
+            response = user_client.post(comments_url, data={'text': 'Да'})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что при создании комментария отзыв '
+            'запрашивается из базы один раз.'
+        )
+
+        response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=second.id, review_id=review.id
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзыв ищется с учётом `title_id` из адреса.'
+        )
+
+    def test_05_duplicate_review(self, user_client, user,
+                                 django_assert_num_queries):
+        title, = create_catalog(1)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = {'text': 'Текст', 'score': 5}
+        with django_assert_num_queries(5):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что создание отзыва не проверяет дубликат '
+            'отдельным запросом.'
+        )
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'отклоняется с ответом 400.'
+        )
+        assert 'non_field_errors' in response.json()
+        assert Review.objects.count() == 1
+
+    @pytest.mark.parametrize('genres_count', (1, 3))
+    def test_06_titles_create_slug_lookup(self, admin_client, admin,
+                                          django_assert_num_queries,
+                                          genres_count):
+        create_catalog(1)
+        data = {
+            'name': 'Новое произведение',
+            'year': 2000,
+            'category': 'films',
+            'genre': [f'genre-{idx}' for idx in range(genres_count)],
+        }
+        admin_client.post(self.TITLES_URL, data=data)
+        with django_assert_num_queries(8) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['genre']) == genres_count
+        lookups = [
+            query['sql'] for query in context.captured_queries
+            if '"slug" = ' in query['sql'] or '"slug" IN' in query['sql']
+        ]
+        assert not lookups, (
+            'Проверьте, что жанры и категория произведения определяются '
+            'по slug без запросов к базе.'
+        )
+
+        data['genre'] = ['unknown']
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.parametrize('limit', (1, 5, 10))
+    def test_07_reviews_and_comments_list_queries(
+            self, client, django_assert_num_queries, limit):
+        title, = create_catalog(1)
+        authors = [
+            User.objects.create(username=f'author{idx}',
+                                email=f'author{idx}@yamdb.fake')
+            for idx in range(limit)
+        ]
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Текст', score=5
+            )
+            for author in authors
+        ]
+        for author in authors:
+            Comment.objects.create(
+                review=reviews[0], author=author, text='Текст'
+            )
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=reviews[0].id
+            ),
+        )
+        for url in urls:
+            with django_assert_num_queries(3):
+                response = client.get(url, {'limit': limit})
+            data = response.json()['results']
+            assert len(data) == limit
+            assert sorted(item['author'] for item in data) == sorted(
+                author.username for author in authors
+            ), (
+                f'Проверьте, что GET-запрос к `{url}` загружает авторов '
+                'вместе с объектами, без запроса на каждую строку.'
+            )
@@ -0,0 +1,86 @@
+import csv
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.csv_data import CSV_DATA_DIR, CSV_FILES
+from reviews.models import Review, Title
+
+
+def count_rows(filename):
+    with open(CSV_DATA_DIR / filename, encoding='utf-8', newline='') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CsvData:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{name}.{file_format}'
+
+    def test_01_import_csv(self):
+        call_command('import_csv', batch_size=10)
+
+        for filename, model, _ in CSV_FILES:
+            assert model.objects.count() == count_rows(filename), (
+                'Проверьте, что команда `import_csv` загружает все строки '
+                f'файла `{filename}`.'
+            )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `import_csv` сохраняет дату '
+            'публикации из файла.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после импорта пересчитывается рейтинг '
+            'произведений.'
+        )
+
+    def test_02_export_round_trip(self, tmp_path):
+        call_command('import_csv')
+        call_command('export_data', tmp_path)
+        counts = {
+            model: model.objects.count() for _, model, _ in CSV_FILES
+        }
+        for _, model, _ in reversed(CSV_FILES):
+            model.objects.all().delete()
+
+        call_command('import_csv', path=tmp_path)
+
+        for model, count in counts.items():
+            assert model.objects.count() == count, (
+                'Проверьте, что файлы команды `export_data` можно снова '
+                f'загрузить командой `import_csv` ({model.__name__}).'
+            )
+        assert Review.objects.get(pk=1).pub_date.year == 2019
+
+    def test_03_export_endpoint(self, client, user_client, admin_client):
+        call_command('import_csv')
+        url = self.EXPORT_URL_TEMPLATE.format(name='titles', file_format='csv')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL_TEMPLATE}` отдаёт данные '
+            'потоком.'
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,name,year,category'
+        assert len(lines) == count_rows('titles.csv') + 1
+
+        response = admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(name='review', file_format='jsonl')
+        )
+        first = json.loads(next(iter(response.streaming_content)))
+        assert set(first) == {
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        }
+
+        response = admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(name='unknown', file_format='csv')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
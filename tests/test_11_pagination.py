@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11Pagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def collect_cursor_pages(self, client, url, keys):
+        ids, pages = [], 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert set(data) == keys, (
+                'Проверьте, что в режиме курсора ответ содержит ключи '
+                f'{", ".join(f"`{key}`" for key in sorted(keys))}.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url, pages = data['next'], pages + 1
+        return ids, pages
+
+    def test_01_cursor_pagination(self, client, admin_client, admin,
+                                  user_client, user, moderator_client,
+                                  moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        for url, objects in ((reviews_url, reviews),
+                             (comments_url, comments)):
+            ids, pages = self.collect_cursor_pages(
+                client, f'{url}?cursor=&limit=2',
+                {'next', 'previous', 'results'}
+            )
+            assert ids == [obj['id'] for obj in objects], (
+                f'Проверьте, что в режиме курсора `{url}` возвращает все '
+                'объекты в порядке публикации.'
+            )
+            assert pages == 2
+
+            data = client.get(f'{url}?limit=2&offset=2').json()
+            assert data['count'] == len(objects), (
+                f'Проверьте, что `{url}` по-прежнему поддерживает '
+                'пагинацию limit/offset.'
+            )
+            assert len(data['results']) == 1
+
+    def test_02_titles_cursor_pagination(self, client,
+                                         django_assert_num_queries):
+        ratings = (None, 7, None, 3, 7, 10, None)
+        for idx, rating in enumerate(ratings):
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+        for title, rating in zip(Title.objects.order_by('id'), ratings):
+            Title.objects.filter(pk=title.pk).update(rating=rating)
+        expected = list(
+            Title.objects.order_by('rating', 'id').values_list('id', flat=True)
+        )
+
+        with django_assert_num_queries(2):
+            data = client.get(f'{self.TITLES_URL}?cursor=&limit=3').json()
+        assert 'count' not in data, (
+            f'Проверьте, что в режиме курсора `{self.TITLES_URL}` '
+            'не считает общее количество произведений.'
+        )
+        ids, pages = self.collect_cursor_pages(
+            client, f'{self.TITLES_URL}?cursor=&limit=3', {'next', 'results'}
+        )
+        assert ids == expected, (
+            f'Проверьте, что в режиме курсора `{self.TITLES_URL}` '
+            'возвращает все произведения в порядке рейтинга.'
+        )
+        assert pages == 3
+
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,129 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CatalogCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_cached_reads(self, client, admin_client,
+                             django_assert_num_queries):
+        create_reviews(admin_client, {})
+        urls = (self.TITLES_URL, self.GENRES_URL, self.CATEGORIES_URL)
+        for url in urls:
+            assert client.get(url).status_code == HTTPStatus.OK
+            with django_assert_num_queries(0):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'обслуживается из кэша без запросов к базе.'
+            )
+
+    def test_02_invalidation(self, client, admin_client, admin, user_client,
+                             user):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        assert client.get(detail_url).json()['rating'] is None
+
+        create_single_review(user_client, titles[1]['id'], 'Текст', 8)
+        assert client.get(detail_url).json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведений.'
+        )
+
+        genres_count = client.get(self.GENRES_URL).json()['count']
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        assert client.get(self.GENRES_URL).json()['count'] == (
+            genres_count + 1
+        ), 'Проверьте, что новый жанр сбрасывает кэш жанров.'
+
+        admin_client.patch(detail_url, data={'genre': ['western']})
+        assert client.get(detail_url).json()['genre'] == [
+            {'name': 'Вестерн', 'slug': 'western'}
+        ], 'Проверьте, что смена жанров сбрасывает кэш произведений.'
+
+        admin_client.delete(f'{self.CATEGORIES_URL}books/')
+        assert client.get(detail_url).json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кэш произведений.'
+        )
+
+    def test_03_conditional_get(self, client, admin_client, admin,
+                                user_client, user, settings,
+                                django_assert_num_queries):
+        settings.CATALOG_CACHE_ETAGS = True
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (self.TITLES_URL, reviews_url):
+            response = client.get(url)
+            etag = response.get('ETag')
+            assert etag, f'Проверьте, что ответ `{url}` содержит ETag.'
+            with django_assert_num_queries(0):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                'If-None-Match получает ответ 304 без запросов к базе.'
+            )
+
+        etag = client.get(reviews_url)['ETag']
+        create_single_review(user_client, titles[0]['id'], 'Текст', 8)
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после нового отзыва ETag списка отзывов меняется.'
+        )
+        assert response['ETag'] != etag
+
+    def test_04_no_etags_with_local_cache(self, client, admin_client):
+        create_reviews(admin_client, {})
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not response.has_header('ETag'), (
+            'Проверьте, что ETag не отдаются, если кэш версий хранится '
+            'в памяти процесса.'
+        )
+
+    def test_05_etag_outlives_response_cache(self, client, admin_client,
+                                             settings, tmp_path):
+        create_reviews(admin_client, {})
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }}
+        settings.CATALOG_CACHE_TIMEOUT = 1
+        etag = client.get(self.TITLES_URL)['ETag']
+        time.sleep(settings.CATALOG_CACHE_TIMEOUT + 0.2)
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при общем кэше ETag без записей не меняется '
+            'после истечения CATALOG_CACHE_TIMEOUT.'
+        )
+
+    def test_06_commands_invalidate(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url).json()['rating'] == 5
+        Review.objects.update(score=9)
+
+        call_command('recalculate_ratings')
+        assert client.get(detail_url).json()['rating'] == 9, (
+            'Проверьте, что команда `recalculate_ratings` сбрасывает кэш '
+            'произведений.'
+        )
@@ -0,0 +1,146 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+from reviews.mailer import BatchMailer
+from reviews.models import OutboxEmail
+from reviews.outbox import enqueue_email, get_executor, send_pending
+
+
+class FailingEmailBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class FailOnceEmailBackend(EmailBackend):
+    calls = 0
+
+    def send_messages(self, messages):
+        FailOnceEmailBackend.calls += 1
+        if FailOnceEmailBackend.calls == 1:
+            raise ConnectionError('SMTP недоступен')
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    SIGNUP_DATA = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+
+    def test_01_worker_delivery(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        outbox_before_count = len(mail.outbox)
+
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что в режиме `worker` регистрация только ставит '
+            'письмо в очередь.'
+        )
+        assert OutboxEmail.objects.filter(
+            recipient=self.SIGNUP_DATA['email'], sent_at__isnull=True
+        ).exists()
+
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_emails` отправляет письма '
+            'из очереди.'
+        )
+        assert mail.outbox[-1].to == [self.SIGNUP_DATA['email']]
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_02_failed_delivery_is_retried(self, client, settings):
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_email_outbox.FailingEmailBackend'
+        )
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ошибка почтового сервера не ломает регистрацию.'
+        )
+        email = OutboxEmail.objects.get()
+        assert (email.sent_at, email.attempts) == (None, 1)
+        assert 'SMTP' in email.last_error
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is None, (
+            'Проверьте, что повторная попытка ждёт своего времени.'
+        )
+
+        OutboxEmail.objects.update(next_attempt_at=email.created_at)
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 2
+
+    def test_03_batches_share_connection(self, settings, tmp_path):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = tmp_path
+        for idx in range(5):
+            enqueue_email('Code', 'Text', f'user{idx}@yamdb.fake')
+
+        with BatchMailer(batch_size=2, flush_interval=60) as mailer:
+            assert send_pending(mailer=mailer) == 5
+        metrics = mailer.metrics.as_dict()
+        assert (
+            metrics['sent'], metrics['batches'], metrics['connections']
+        ) == (5, 3, 1), (
+            'Проверьте, что группы писем отправляются через одно соединение.'
+        )
+        assert metrics['messages_per_second'] > 0
+        assert len(list(tmp_path.iterdir())) == 1
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_04_thread_delivery_retries(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'thread'
+        settings.EMAIL_OUTBOX_RETRY_DELAY = 0.2
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_email_outbox.FailOnceEmailBackend'
+        )
+        FailOnceEmailBackend.calls = 0
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+
+        deadline = time.monotonic() + 5
+        while len(mail.outbox) == outbox_before_count:
+            assert time.monotonic() < deadline, (
+                'Проверьте, что в режиме `thread` неудачное письмо '
+                'повторно отправляется по истечении задержки.'
+            )
+            time.sleep(0.05)
+        get_executor().submit(lambda: None).result()
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is not None and email.attempts == 2
+
+    def test_05_sent_emails_are_purged(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        call_command('send_emails')
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is not None and email.message == '', (
+            'Проверьте, что текст отправленного письма с кодом '
+            'подтверждения не хранится в очереди.'
+        )
+        exhausted = enqueue_email('Code', 'Text', 'lost@yamdb.fake')
+        OutboxEmail.objects.filter(pk=exhausted.pk).update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        )
+
+        call_command('send_emails')
+        assert not OutboxEmail.objects.exists(), (
+            'Проверьте, что команда `send_emails` удаляет отправленные '
+            'письма и письма, исчерпавшие попытки.'
+        )
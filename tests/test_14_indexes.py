@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса проверяется в SQLite.'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Indexes:
+
+    def get_query_plan(self, client, url):
+        """Возвращает планы SELECT-запросов, выполненных для страницы."""
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if not query['sql'].startswith('SELECT'):
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+                plans.append(' '.join(str(row[-1]) for row in cursor))
+        return '\n'.join(plans)
+
+    @pytest.mark.parametrize('url_template,index', (
+        ('/api/v1/titles/{title_id}/reviews/', 'review_title_pub_date_idx'),
+        (
+            '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            'comment_review_pub_date_idx'
+        ),
+        ('/api/v1/titles/?category={category}', 'title_category_rating_idx'),
+        ('/api/v1/titles/?year=1984', 'title_year_idx'),
+        ('/api/v1/titles/?cursor=', 'title_rating_id_idx'),
+    ))
+    def test_01_list_uses_index(self, client, admin_client, admin,
+                                url_template, index):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = url_template.format(
+            title_id=titles[0]['id'],
+            review_id=reviews[0]['id'],
+            category=titles[0]['category'],
+        )
+        plan = self.get_query_plan(client, url)
+        assert index in plan, (
+            f'Проверьте, что запрос к `{url_template}` использует индекс '
+            f'`{index}`. План запроса:\n{plan}'
+        )
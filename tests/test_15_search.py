@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет по названию '
+            'без учёта регистра.'
+        )
+        assert self.search(client, 'крепк') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` ищет по началу слова.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` ищет по описанию.'
+        )
+        assert self.search(client, 'орешек терминатор') == []
+        assert self.search(client, '"*') == []
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'name': 'Чужой', 'description': 'Орешек в космосе'}
+        )
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'орешек') == [
+            'Крепкий орешек', 'Чужой'
+        ], (
+            'Проверьте, что совпадение в названии выше совпадения '
+            'в описании.'
+        )
+
+        admin_client.delete(f'{self.TITLES_URL}{titles[1]["id"]}/')
+        assert self.search(client, 'орешек') == ['Чужой']
+
+    def test_02_rebuild_search_index(self, client, admin_client):
+        create_titles(admin_client)
+        Title.objects.filter(name='Терминатор').update(name='Робокоп')
+        assert self.search(client, 'робокоп') == []
+
+        call_command('rebuild_search_index')
+        assert self.search(client, 'робокоп') == ['Робокоп'], (
+            'Проверьте, что команда `rebuild_search_index` '
+            'перестраивает поисковый индекс.'
+        )
@@ -0,0 +1,96 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from api.ngram import NGRAM_INDEXES, get_executor
+from api.cache import GENRES
+from reviews.models import Genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16NgramSearch:
+
+    GENRES_URL = '/api/v1/genres/'
+    USERS_URL = '/api/v1/users/'
+
+    def search(self, client, url, query):
+        response = client.get(url, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return sorted(item['name'] for item in response.json()['results'])
+
+    def test_01_genre_search(self, client):
+        for name, slug in (('Фантастика', 'sci-fi'), ('Фэнтези', 'fantasy'),
+                           ('Драма', 'drama')):
+            Genre.objects.create(name=name, slug=slug)
+        assert self.search(client, self.GENRES_URL, 'фант') == [
+            'Фантастика'
+        ], (
+            'Проверьте, что параметр `search` ищет жанры по вхождению '
+            'без учёта регистра.'
+        )
+        assert self.search(client, self.GENRES_URL, 'фонтастика') == [
+            'Фантастика'
+        ], 'Проверьте, что параметр `search` находит жанры с опечатками.'
+        assert self.search(client, self.GENRES_URL, 'вестерн') == []
+
+        Genre.objects.create(name='Мелодрама', slug='melodrama')
+        Genre.objects.filter(slug='drama').delete()
+        assert self.search(client, self.GENRES_URL, 'драма') == [
+            'Мелодрама'
+        ], (
+            'Проверьте, что индекс поиска обновляется при создании '
+            'и удалении жанров.'
+        )
+
+    def test_02_user_search(self, admin_client, admin, user):
+        response = admin_client.get(
+            self.USERS_URL, {'search': user.username[1:]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        usernames = [item['username'] for item in response.json()['results']]
+        assert usernames == [user.username], (
+            'Проверьте, что параметр `search` ищет пользователей '
+            'по части имени.'
+        )
+
+    def test_03_rows_from_other_processes(self, client):
+        Genre.objects.create(name='Фантастика', slug='sci-fi')
+        assert self.search(client, self.GENRES_URL, 'фант') == ['Фантастика']
+        # Запись другого процесса: сигналы этого процесса не срабатывают.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO reviews_genre (name, slug) '
+                "VALUES ('Фантастика и фэнтези', 'sci-fi-fantasy')"
+            )
+        assert self.search(client, self.GENRES_URL, 'Фантаст') == [
+            'Фантастика', 'Фантастика и фэнтези'
+        ], (
+            'Проверьте, что поиск находит записи, созданные после '
+            'построения индекса в другом процессе.'
+        )
+
+    def test_04_background_build(self, client, settings):
+        settings.NGRAM_INDEX_BACKGROUND = True
+        Genre.objects.create(name='Фантастика', slug='sci-fi')
+        assert self.search(client, self.GENRES_URL, 'Фант') == [
+            'Фантастика'
+        ], 'Проверьте, что до построения индекса поиск идёт по базе.'
+        get_executor().submit(lambda: None).result()
+        assert NGRAM_INDEXES[GENRES].built_at is not None, (
+            'Проверьте, что индекс строится в фоновом потоке.'
+        )
+        assert self.search(client, self.GENRES_URL, 'фонтастика') == [
+            'Фантастика'
+        ]
+
+    def test_05_benchmark_command(self):
+        Genre.objects.create(name='Фантастика', slug='sci-fi')
+        out = StringIO()
+        call_command('benchmark_search', 'фант', repeat=2, stdout=out)
+        results = json.loads(out.getvalue())
+        assert results['genres']['rows'] == 1
+        assert {'icontains_ms', 'ngram_ms'} <= set(results['genres'])
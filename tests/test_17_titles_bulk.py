@@ -0,0 +1,185 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitlesBulk:
+
+    TITLES_URL = '/api/v1/titles/'
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def post(self, client, data):
+        return client.post(
+            self.BULK_URL, data=json.dumps(data),
+            content_type='application/json'
+        )
+
+    def create_catalog(self):
+        Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(3)
+        )
+
+    def test_01_bulk_create_and_update(self, admin_client, user_client,
+                                       django_assert_max_num_queries):
+        self.create_catalog()
+        existing = Title.objects.create(name='Старое', year=1990)
+        items = [
+            {
+                'name': f'Произведение {idx}', 'year': 2000,
+                'category': 'films',
+                'genre': [f'genre-{idx % 3}', 'genre-2'],
+            }
+            for idx in range(20)
+        ]
+        items.append(
+            {'id': existing.id, 'name': 'Обновлённое', 'genre': ['genre-0']}
+        )
+        response = self.post(user_client, items)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        with django_assert_max_num_queries(12):
+            response = self.post(admin_client, items)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'с корректным пакетом возвращает статус 201.'
+        )
+        results = response.json()
+        assert [item['status'] for item in results] == (
+            ['created'] * 20 + ['updated']
+        )
+        assert results[-1]['id'] == existing.id
+        title = Title.objects.get(pk=results[0]['id'])
+        assert title.name == 'Произведение 0'
+        assert sorted(title.genre.values_list('slug', flat=True)) == [
+            'genre-0', 'genre-2'
+        ], 'Проверьте, что пакетная загрузка сохраняет жанры произведений.'
+        existing.refresh_from_db()
+        assert existing.name == 'Обновлённое'
+        assert list(existing.genre.values_list('slug', flat=True)) == [
+            'genre-0'
+        ]
+
+        names = [
+            title['name'] for title in
+            admin_client.get(self.TITLES_URL, {'search': 'обновлённое'})
+            .json()['results']
+        ]
+        assert names == ['Обновлённое'], (
+            'Проверьте, что пакетная загрузка обновляет поисковый индекс.'
+        )
+
+    def test_02_bulk_validation(self, admin_client):
+        self.create_catalog()
+        items = [
+            {
+                'name': 'Верное', 'year': 2000, 'category': 'films',
+                'genre': ['genre-0']
+            },
+            {
+                'name': 'Без жанра', 'year': 2000, 'category': 'films',
+                'genre': ['unknown']
+            },
+            {'id': 100500, 'name': 'Нет такого'},
+            'не объект',
+        ]
+        response = self.post(admin_client, items)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        results = response.json()
+        assert [item['status'] for item in results] == [
+            'valid', 'invalid', 'invalid', 'invalid'
+        ], 'Проверьте, что ошибки пакета возвращаются по каждому элементу.'
+        assert 'genre' in results[1]['errors']
+        assert not Title.objects.exists(), (
+            'Проверьте, что пакет с ошибками не сохраняется частично.'
+        )
+
+        response = self.post(admin_client, {'name': 'Один'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_bulk_ndjson(self, admin_client):
+        self.create_catalog()
+        lines = '\n'.join(
+            json.dumps({
+                'name': name, 'year': 2000, 'category': 'films',
+                'genre': ['genre-1']
+            })
+            for name in ('Первое', 'Второе')
+        )
+        response = admin_client.post(
+            self.BULK_URL, data=lines, content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что `{self.BULK_URL}` принимает NDJSON.'
+        )
+        assert Title.objects.filter(genre__slug='genre-1').count() == 2
+
+        response = admin_client.post(
+            self.BULK_URL, data='{"name":', content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_stale_slug_cache(self, admin_client):
+        self.create_catalog()
+        title = {
+            'name': 'Первое', 'year': 2000, 'category': 'films',
+            'genre': ['genre-0']
+        }
+        response = admin_client.post(
+            self.TITLES_URL, data=json.dumps(title),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        # Удаление в другом процессе: сигналы этого процесса не срабатывают.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM reviews_genre WHERE slug = 'genre-1'"
+            )
+
+        title['genre'] = ['genre-1']
+        response = admin_client.post(
+            self.TITLES_URL, data=json.dumps(title),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что slug жанра, удалённого после загрузки кеша, '
+            'приводит к ошибке 400, а не 500.'
+        )
+        assert 'genre' in response.json()
+
+        response = self.post(admin_client, [title])
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.BULK_URL}` отклоняет slug жанра, '
+            'удалённого после загрузки кеша.'
+        )
+        assert response.json()[0]['status'] == 'invalid'
+        assert Title.objects.count() == 1
+
+    def test_05_bulk_create_without_returned_ids(self, admin_client,
+                                                 monkeypatch):
+        self.create_catalog()
+        monkeypatch.setattr(connections['default'], 'vendor', 'other')
+        items = [
+            {
+                'name': f'Произведение {idx}', 'year': 2000,
+                'category': 'films', 'genre': [f'genre-{idx}'],
+            }
+            for idx in range(3)
+        ]
+        response = self.post(admin_client, items)
+        assert response.status_code == HTTPStatus.CREATED
+        for item, result in zip(items, response.json()):
+            title = Title.objects.get(pk=result['id'])
+            assert title.name == item['name'], (
+                'Проверьте, что на СУБД без возврата id из вставки '
+                'произведения получают свои id.'
+            )
+            assert [genre.slug for genre in title.genre.all()] == (
+                item['genre']
+            )
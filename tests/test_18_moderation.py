@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Moderation:
+
+    REVIEWS_URL = '/api/v1/moderation/reviews/'
+    COMMENTS_URL = '/api/v1/moderation/comments/'
+
+    def create_reviews(self, user, moderator):
+        first = Title.objects.create(name='Первое', year=2000)
+        second = Title.objects.create(name='Второе', year=2000)
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+            for title, author, score in (
+                (first, user, 10), (second, user, 4), (first, moderator, 2)
+            )
+        ]
+        for review in reviews:
+            Comment.objects.create(review=review, author=user, text='Спам')
+        return first, second, reviews
+
+    def test_01_bulk_delete_reviews(self, user_client, user, moderator_client,
+                                    moderator,
+                                    django_assert_max_num_queries):
+        first, second, reviews = self.create_reviews(user, moderator)
+        response = user_client.post(
+            self.REVIEWS_URL, data={'action': 'delete', 'ids': [reviews[2].id]}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пользователь не может массово удалять '
+            'чужие отзывы.'
+        )
+        response = moderator_client.post(
+            self.REVIEWS_URL, data={'action': 'delete'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        with django_assert_max_num_queries(9):
+            response = moderator_client.post(
+                self.REVIEWS_URL,
+                data={'action': 'delete', 'author': user.username}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'action': 'delete', 'count': 2}
+        assert list(Review.objects.values_list('id', flat=True)) == [
+            reviews[2].id
+        ]
+        assert Comment.objects.count() == 1, (
+            'Проверьте, что массовое удаление отзывов удаляет '
+            'и комментарии к ним.'
+        )
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.rating, second.rating) == (2, None), (
+            'Проверьте, что после массового удаления отзывов рейтинг '
+            'произведений пересчитывается.'
+        )
+
+    def test_02_bulk_edit_comments(self, user_client, user, moderator,
+                                   moderator_client):
+        first, _, reviews = self.create_reviews(user, moderator)
+        response = user_client.post(
+            self.COMMENTS_URL,
+            data={'action': 'edit', 'title': first.id, 'text': 'Скрыто'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что пользователь может массово править '
+            'свои комментарии.'
+        )
+        assert response.json()['count'] == 2
+        assert sorted(Comment.objects.values_list('text', flat=True)) == [
+            'Скрыто', 'Скрыто', 'Спам'
+        ]
+        response = moderator_client.post(
+            self.COMMENTS_URL, data={'action': 'edit', 'title': first.id}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        response = moderator_client.post(
+            self.COMMENTS_URL, data={
+                'action': 'delete',
+                'pub_date_after': '2000-01-01T00:00:00Z',
+            }
+        )
+        assert response.json()['count'] == 3
+        assert not Comment.objects.exists()
+
+    def test_03_bulk_delete_invalidates_cache(self, client, user, moderator,
+                                              moderator_client):
+        first, _, reviews = self.create_reviews(user, moderator)
+        title_url = f'/api/v1/titles/{first.id}/'
+        comments_url = (
+            f'{title_url}reviews/{reviews[0].id}/comments/'
+        )
+        assert client.get(title_url).json()['rating'] == 6
+        assert client.get(comments_url).json()['count'] == 1
+
+        response = moderator_client.post(
+            self.REVIEWS_URL, data={'action': 'delete', 'ids': [reviews[2].id]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(title_url).json()['rating'] == 10, (
+            'Проверьте, что массовое удаление отзывов сбрасывает кэш '
+            'произведений.'
+        )
+        response = moderator_client.post(
+            self.COMMENTS_URL, data={'action': 'delete', 'title': first.id}
+        )
+        assert response.json()['count'] == 1
+        assert client.get(comments_url).json()['count'] == 0, (
+            'Проверьте, что массовое удаление комментариев сбрасывает кэш '
+            'комментариев.'
+        )
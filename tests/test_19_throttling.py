@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.throttling import LocalBucketStore
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_token_bucket(self):
+        store = LocalBucketStore()
+        results = [store.consume('key', 2, 0.5, now)[0] for now in (0, 0, 0)]
+        assert results == [True, True, False]
+        assert store.consume('key', 2, 0.5, 1) == (False, 1.0)
+        assert store.consume('key', 2, 0.5, 2) == (True, 0), (
+            'Проверьте, что корзина пополняется со временем.'
+        )
+        assert store.consume('other', 2, 0.5, 2)[0]
+
+    @pytest.mark.parametrize('store', (
+        'api.throttling.LocalBucketStore', 'api.throttling.CacheBucketStore'
+    ))
+    def test_02_auth_endpoints_throttled(self, client, settings, store):
+        settings.THROTTLE_BUCKET_STORE = store
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'signup': '2/min', 'token': '1/min'},
+        }
+        for url, limit in ((self.URL_SIGNUP, 2), (self.URL_TOKEN, 1)):
+            for _ in range(limit):
+                response = client.post(url, data={})
+                assert response.status_code == HTTPStatus.BAD_REQUEST
+            response = client.post(url, data={})
+            assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+                f'Проверьте, что частота POST-запросов к `{url}` '
+                'ограничена.'
+            )
+            assert int(response['Retry-After']) > 0
+        response = client.post(
+            self.URL_TOKEN, data={}, REMOTE_ADDR='10.0.0.1'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что лимит запросов считается для каждого IP отдельно.'
+        )
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Avg, Count, Max
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+SIZES = {
+    'users': 20, 'categories': 2, 'genres': 4, 'titles': 40,
+    'reviews': 150, 'comments': 60,
+}
+
+
+def generate(seed=1, **options):
+    call_command(
+        'generate_dataset', seed=seed, batch_size=16, stdout=StringIO(),
+        **SIZES, **options
+    )
+    return list(
+        Review.objects.order_by('id').values_list(
+            'title__name', 'author__username', 'score', 'pub_date'
+        )
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20GenerateDataset:
+
+    def test_01_generate_dataset(self):
+        reviews = generate()
+        for model, name in ((User, 'users'), (Category, 'categories'),
+                            (Genre, 'genres'), (Title, 'titles'),
+                            (Review, 'reviews'), (Comment, 'comments')):
+            assert model.objects.count() == SIZES[name], (
+                'Проверьте, что команда `generate_dataset` создаёт '
+                f'заданное количество объектов {name}.'
+            )
+        review_counts = sorted(
+            Title.objects.annotate(count=Count('reviews'))
+            .values_list('count', flat=True)
+        )
+        assert review_counts[0] == 0 and review_counts[-1] == SIZES['users'], (
+            'Проверьте, что отзывы распределены неравномерно: у популярных '
+            'произведений много отзывов, у части произведений их нет.'
+        )
+        title = Title.objects.exclude(rating=None).first()
+        assert title.rating == int(
+            title.reviews.aggregate(avg=Avg('score'))['avg']
+        ), 'Проверьте, что рейтинг созданных произведений пересчитан.'
+
+        User.objects.all().delete()
+        Title.objects.all().delete()
+        assert generate() == reviews, (
+            'Проверьте, что при одном и том же seed создаются '
+            'одинаковые данные.'
+        )
+        User.objects.all().delete()
+        Title.objects.all().delete()
+        assert generate(seed=2) != reviews
+
+    def test_02_reference_time(self):
+        generate(now=datetime(2020, 6, 1, tzinfo=timezone.utc))
+        assert Review.objects.aggregate(
+            last=Max('pub_date')
+        )['last'] <= datetime(2020, 6, 1, tzinfo=timezone.utc), (
+            'Проверьте, что даты публикаций отсчитываются от `--now`.'
+        )
+        assert Title.objects.aggregate(last=Max('year'))['last'] <= 2020
+
+        with pytest.raises(CommandError):
+            generate(now=datetime(3000, 1, 1))
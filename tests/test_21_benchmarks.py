@@ -0,0 +1,69 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import URLResolver
+
+from api.benchmarks.endpoints import ENDPOINTS, run_benchmarks
+from api.urls import urlpatterns
+
+METRICS = {
+    'requests', 'status', 'queries', 'requests_per_second',
+    'p50_ms', 'p95_ms', 'p99_ms', 'samples_ms',
+}
+
+
+def api_routes(patterns):
+    """Пары (имя маршрута, метод) для всех маршрутов api/urls.py."""
+    routes = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            routes |= api_routes(pattern.url_patterns)
+            continue
+        view = pattern.callback
+        methods = set(getattr(view, 'actions', None) or (
+            method for method in view.cls.http_method_names
+            if hasattr(view.cls, method)
+        ))
+        methods &= set(view.cls.http_method_names) - {'head', 'options'}
+        routes |= {(pattern.name, method) for method in methods}
+    return routes
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Benchmarks:
+
+    def test_01_endpoints_cover_routes(self):
+        routes = {(endpoint.route, endpoint.method) for endpoint in ENDPOINTS}
+        missing = api_routes(urlpatterns) - routes
+        assert not missing, (
+            'Проверьте, что замеры покрывают все маршруты и методы API, '
+            f'нет замеров для {sorted(missing)}.'
+        )
+
+    def test_02_run_benchmarks(self):
+        results = run_benchmarks([5, 10], repeat=3)
+        assert set(results['sizes']) == {'5', '10'}
+        for size_results in results['sizes'].values():
+            assert set(size_results) == {
+                endpoint.name for endpoint in ENDPOINTS
+            }
+            for name, metrics in size_results.items():
+                assert set(metrics) == METRICS
+                assert metrics['status'] < 400, (
+                    f'Проверьте, что замер `{name}` выполняет '
+                    'успешные запросы.'
+                )
+                assert metrics['queries'] > 0
+                assert metrics['p50_ms'] <= metrics['p99_ms']
+
+    def test_03_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            'benchmark_endpoints', sizes=[5], repeat=1,
+            endpoint=['titles-list'], stdout=out
+        )
+        document = json.loads(out.getvalue())
+        assert document['kind'] == 'endpoints'
+        assert list(document['results']['sizes']['5']) == ['titles-list']
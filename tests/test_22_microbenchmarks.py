@@ -0,0 +1,39 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+
+from api.benchmarks.micro import run_microbenchmarks
+from api.slugs import SLUG_CACHES
+
+
+class Test22Microbenchmarks:
+
+    def test_01_run_microbenchmarks(self):
+        built_at = {key: cache.built_at for key, cache in SLUG_CACHES.items()}
+        results = run_microbenchmarks(count=20, repeat=2)
+        names = set(results['cases'])
+        for name in ('TitleReadSerializer', 'TitleEditSerializer',
+                     'ReviewSerializer', 'CommentSerializer',
+                     'UserSerializer'):
+            assert f'{name}.to_representation' in names, (
+                f'Проверьте, что микробенчмарки замеряют `{name}`.'
+            )
+        assert {
+            'IsAdmin', 'IsAdminOrReadOnly',
+            'IsAuthorModeratorAdminOrReadOnly'
+        } <= names
+        for metrics in results['cases'].values():
+            assert metrics['objects'] == 20
+            assert metrics['objects_per_second'] > 0
+            assert metrics['peak_bytes_per_object'] >= 0
+        assert built_at == {
+            key: cache.built_at for key, cache in SLUG_CACHES.items()
+        }, 'Проверьте, что замеры восстанавливают кеши slug.'
+
+    def test_02_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_micro', objects=5, repeat=1, stdout=out)
+        document = json.loads(out.getvalue())
+        assert document['kind'] == 'micro'
+        assert document['results']['objects'] == 5
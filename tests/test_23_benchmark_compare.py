@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from api.benchmarks.results import (
+    KIND_ENDPOINTS, build_document, compare_documents, load_document,
+    mann_whitney_p, save_document
+)
+
+
+def endpoint_results(samples, queries=2):
+    return {
+        'repeat': len(samples),
+        'seed': 0,
+        'sizes': {'100': {'titles-list': {
+            'requests': len(samples), 'status': 200, 'queries': queries,
+            'samples_ms': samples,
+        }}},
+    }
+
+
+BASELINE = [1.0, 1.1, 0.9, 1.05, 0.95, 1.02, 0.98, 1.01, 0.99, 1.03]
+
+
+class Test23BenchmarkCompare:
+
+    def test_01_mann_whitney(self):
+        assert mann_whitney_p(BASELINE, BASELINE) > 0.4
+        slower = [value * 2 for value in BASELINE]
+        assert mann_whitney_p(BASELINE, slower) < 0.001
+        assert mann_whitney_p(slower, BASELINE) > 0.99
+
+    def test_02_compare_documents(self, tmp_path):
+        baseline = build_document(KIND_ENDPOINTS, endpoint_results(BASELINE))
+        path = save_document(baseline, tmp_path)
+        assert path.parent == tmp_path / KIND_ENDPOINTS
+        assert load_document(path) == baseline
+
+        same = build_document(KIND_ENDPOINTS, endpoint_results(BASELINE))
+        assert compare_documents(baseline, same, 0.1, 0.01) == []
+        slower = build_document(KIND_ENDPOINTS, endpoint_results(
+            [value * 1.5 for value in BASELINE], queries=3
+        ))
+        regressions = compare_documents(baseline, slower, 0.1, 0.01)
+        assert {item['metric'] for item in regressions} == {
+            'median_ms', 'queries'
+        }, (
+            'Проверьте, что сравнение находит замедление и рост числа '
+            'SQL-запросов.'
+        )
+        assert regressions[0]['case'] == '100/titles-list'
+
+    def test_03_compare_command(self, tmp_path):
+        baseline = tmp_path / 'baseline.json'
+        current = tmp_path / 'current.json'
+        baseline.write_text(json.dumps(
+            build_document(KIND_ENDPOINTS, endpoint_results(BASELINE))
+        ))
+        current.write_text(json.dumps(build_document(
+            KIND_ENDPOINTS, endpoint_results(BASELINE, queries=5)
+        )))
+        call_command('benchmark_compare', str(baseline), str(baseline))
+        with pytest.raises(CommandError) as error:
+            call_command('benchmark_compare', str(baseline), str(current))
+        assert error.value.returncode == 1, (
+            'Проверьте, что `benchmark_compare` завершается с ошибкой '
+            'при регрессии.'
+        )
+        document = json.loads(current.read_text())
+        document['format_version'] = 0
+        current.write_text(json.dumps(document))
+        with pytest.raises(CommandError) as error:
+            call_command('benchmark_compare', str(baseline), str(current))
+        assert error.value.returncode == 2